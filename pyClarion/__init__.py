@@ -3,7 +3,7 @@ from .numdicts import (ValidationError, Key, KeyForm,
 from .events import Update, Event, Clock, Process, Site 
 from .knowledge import (Symbol, Term, Sort, Family, Atom, Compound, Chunk, Rule, 
     Atoms, Chunks, Rules)
-from .components import (Environment, Agent, Input, Choice, Pool, 
+from .components import (Environment, Agent, Sweep, Input, Choice, Pool, 
     TopDown, BottomUp, ChunkStore, Layer, Priority 
     # RuleStore, FixedRules, 
     # BaseLevel,
@@ -21,8 +21,8 @@ __all__ = [
     "Symbol", "Term", "Sort", "Family", "Atom", "Compound", "Chunk", "Rule", 
     "Atoms", "Chunks", "Rules",
     # from components
-    "Environment", "Agent", "Input", "Choice", "Pool", "TopDown", "BottomUp", 
-    "ChunkStore", "Layer" 
+    "Environment", "Agent", "Sweep", "Input", "Choice", "Pool", "TopDown", 
+    "BottomUp",     "ChunkStore", "Layer" 
     #"RuleStore", "FixedRules", 
     # "BaseLevel",
     # "Optimizer", "Activation", "Cost", "ErrorSignal",
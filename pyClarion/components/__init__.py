@@ -1,10 +1,10 @@
 from .base import Priority
 from .io import  Input, Choice
-from .sim import Environment, Agent
+from .sim import Environment, Agent, Sweep
 from .chunks import ChunkStore, BottomUp, TopDown
 from .layers import Pool, Layer
 from .learning import TDLearning
-from .optimizers import SGD, Adam
+from .optimizers import SGD, Adam, LazyAdam
     # #PoolBL, PoolTL, ChunkAssocs, 
     # BottomUp, TopDown)
 # from .networks import (Train, Layer, Optimizer, ErrorSignal, Activation, 
@@ -17,14 +17,14 @@ from .optimizers import SGD, Adam
 
 __all__ = [
     "Priority",
-    "Environment", "Agent", "Input", "Choice", "Pool", 
+    "Environment", "Agent", "Sweep", "Input", "Choice", "Pool", 
     #"ChunkAssocs", 
     "ChunkStore", "BottomUp", "TopDown",
     # "RuleStore", "FixedRules", 
     # "BaseLevel",   
     "Layer", #"Optimizer", "Activation", "Cost", "ErrorSignal", "LeastSquares", 
     # "Tanh", "Supervised", "TDError", "Train", 
-    "SGD", "Adam",
+    "SGD", "Adam", "LazyAdam",
     #"SupervisedLearning", 
     "TDLearning"
     # "MLP", "IDN"
@@ -5,6 +5,7 @@ from enum import IntEnum
 
 from ..events import Process, Site, State, Event, ForwardUpdate, KeyspaceUpdate
 from ..knowledge import Root, Family, Sort, Term, Atoms, Atom, Chunks, Chunk, Rules, Rule
+from ..knowledge.serial import _dump_sort, _load_sorts
 from ..numdicts import Index, keyform, Key, NumDict
 from ..numdicts.ops.tape import GradientTape
 
@@ -83,6 +84,13 @@ class Component(Process[Root]):
                     indices.append(idx_d)
         return indices
 
+    def _init_batch(self, b: Atoms | None, *indices: Index) -> Sequence[Index]:
+        """Prefix indices with batch index over b, if b is not None."""
+        if b is None:
+            return indices
+        idx_b, = self._init_indexes(b)
+        return [idx_b * idx for idx in indices]
+
     def _init_sort[S: Sort](self, 
         family: Family, 
         sort_cls: type[S],
@@ -132,7 +140,7 @@ class Stateful[S: Atoms](Component):
     def locked(self) -> bool:
         if self.current_status != ~self.s[next(iter(self.s))]:
             return True
-        elif any(event.source in self._triggers for event in self.system.queue):
+        elif any(trigger in self.system.pending for trigger in self._triggers):
             return True
         return False
 
@@ -159,6 +167,7 @@ class Stateful[S: Atoms](Component):
 
 
 class Backpropagator(Component):
+    parallel = True
     tapes: deque[tuple[GradientTape[NumDict], NumDict, list[NumDict]]]
     forward: Callable[..., Event]
     backward: Callable[..., Event]
@@ -168,4 +177,9 @@ class Backpropagator(Component):
         main: NumDict, 
         args: list[NumDict]
     ) -> None:
+        # Taped arguments are marked aliased so that in-place writers (e.g., 
+        # LazyAdam, trusted updates) replace them instead of mutating them 
+        # under the tape.
+        for arg in args:
+            arg._a = True
         self.tapes.appendleft((tape, main, args))
@@ -1,10 +1,13 @@
 from typing import Self, Any
 from datetime import timedelta
+from os import PathLike
 import logging
 
 from .base import Component, Parametric, Priority, ChunkUpdate
+from .base import _dump_sort, _load_sorts
 from .ops import cam
 from ..numdicts import NumDict, KeyForm, keyform, ks_crawl, Undefined
+from ..numdicts import NumDictWriter, NumDictFile
 from ..knowledge import (Family, Buses, Atoms, Chunks, Chunk, Bus, Atom, 
     DVPairs, ChunkFamily, DataFamily)
 from ..events import Event, State, Site, ForwardUpdate 
@@ -18,10 +21,11 @@ class BottomUp[D: DVPairs](Component):
     Propagates activations from the bottom level to the top level.
     """
 
+    parallel = True
     c: Chunks
     d: D
     main: Site = Site()
-    input: Site = Site()
+    input: Site = Site(watch=ForwardUpdate)
     weights: Site = Site()
     mul_by: KeyForm
     sum_by: KeyForm
@@ -81,10 +85,11 @@ class TopDown[D: DVPairs](Component):
     Propagates activations from the top level to the bottom level.
     """
 
+    parallel = True
     c: Chunks
     d: D
     main: Site = Site()
-    input: Site = Site()
+    input: Site = Site(watch=ForwardUpdate)
     weights: Site = Site()
     mul_by: KeyForm
     agg_by: KeyForm
@@ -162,6 +167,7 @@ class ChunkStore[D: DVPairs](Component):
         self.system.check_root(c, b, v)
         self.c = Chunks(); c[name] = self.c
         self.d = d
+        self.subscribe((ChunkUpdate, self.c))
         idx_c = self.system.get_index(keyform(self.c))
         idx_b = self.system.get_index(keyform(b))
         idx_v = self.system.get_index(keyform(v))
@@ -181,7 +187,7 @@ class ChunkStore[D: DVPairs](Component):
     def resolve(self, event: Event) -> None:
         updates = event.index(ChunkUpdate).get(self.c, [])
         new_chunks = [chunk for ud in updates for chunk in ud.add]
-        if new_chunks:
+        if new_chunks and event.source != self.load:
             if event.source == self.encode \
                 and self.system.logger.isEnabledFor(logging.DEBUG):
                 self.log_encoding(new_chunks)
@@ -234,6 +240,38 @@ class ChunkStore[D: DVPairs](Component):
              ForwardUpdate(self.buw, buw, "write")],
             dt, priority)
     
+    def save(self, file: str | PathLike) -> None:
+        """
+        Write chunk names, chunk contents and current weights to file.
+        """
+        with NumDictWriter(file) as writer:
+            writer.meta["c"] = _dump_sort(self.c)
+            for name in ("ciw", "tdw", "buw"):
+                writer.write(name, getattr(self, name)[0])
+
+    def load(self, 
+        file: str | PathLike, 
+        dt: timedelta = timedelta(), 
+        priority=Priority.LEARNING
+    ) -> Event:
+        """
+        Restore chunks and weights saved to file by save().
+        
+        Adds saved chunks missing from the store in a single update and writes 
+        their weights in bulk, without recompiling chunks. Restored chunks 
+        carry their saved contents; constituents outside the file are looked 
+        up by key in the system root.
+        """
+        with NumDictFile(file) as f:
+            new, = _load_sorts(self.system.root, (self.c, f.meta["c"], Chunk))
+            ciw, tdw, buw = f.data("ciw"), f.data("tdw"), f.data("buw")
+        return Event(self.load,
+            [ChunkUpdate(self.c, add=new),
+             ForwardUpdate(self.ciw, ciw, "write"),
+             ForwardUpdate(self.tdw, tdw, "write"),
+             ForwardUpdate(self.buw, buw, "write")],
+            dt, priority)
+
     def bottom_up(self, 
         name: str, 
         *, 
@@ -265,7 +303,7 @@ class ChunkExtractor[D: DVPairs](Parametric, Component):
     p: Params
     c: Chunks
     d: D
-    input_t: Site = Site()
+    input_t: Site = Site(watch=ForwardUpdate)
     input_b: Site = Site()
     params: Site = Site()
     auto: bool
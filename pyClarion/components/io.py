@@ -1,4 +1,4 @@
-from typing import overload, Callable
+from typing import overload, Callable, Sequence
 from datetime import timedelta
 from math import exp
 
@@ -13,9 +13,13 @@ class Input[D: Nodes](Component):
     An input receiver process.
     
     Receives activations from external sources.
+
+    If a batch sort b is given, the main site is indexed by members of b and 
+    batches of inputs may be sent in a single event with send_batch().
     """
 
     d: D
+    b: Atoms | None
     main: Site = Site()
     reset: bool
 
@@ -23,13 +27,15 @@ class Input[D: Nodes](Component):
         name: str, 
         d: D,
         *,
+        b: Atoms | None = None,
         c: float = 0.0,
         reset: bool = True,
         l: int = 1
     ) -> None:
         super().__init__(name)
-        index, = self._init_indexes(d)
+        index, = self._init_batch(b, *self._init_indexes(d))
         self.d = d 
+        self.b = b
         self.main = State(index, {}, c, l)
         self.reset = reset
 
@@ -69,27 +75,53 @@ class Input[D: Nodes](Component):
         data = self._parse_input(d)
         method = "push" if self.reset else "write"
         return Event(self.send, 
-            [ForwardUpdate(self.main, data, method)], 
+            [ForwardUpdate(self.main, data, method, trusted=True)], 
             dt, priority)
 
-    def _parse_input(self, d: dict | Chunk) -> dict[Key, float]:
+    def send_batch(self, ds: Sequence[dict | Chunk], 
+        dt: timedelta = timedelta(), 
+        priority: int = Priority.PROPAGATION
+    ) -> Event:
+        """
+        Update input data for a whole batch.
+        
+        The i-th element of ds is assigned to the i-th member of the batch sort.
+        """
+        if self.b is None:
+            raise ValueError(f"Process {self.name} is not batched")
+        members = list(self.b)
+        if len(members) < len(ds):
+            raise ValueError(f"Expected at most {len(members)} samples, "
+                f"got {len(ds)}")
+        data = {}
+        for name, d in zip(members, ds):
+            data.update(self._parse_input(d, prefix=~self.b[name]))
+        method = "push" if self.reset else "write"
+        return Event(self.send_batch, 
+            [ForwardUpdate(self.main, data, method, trusted=True)], 
+            dt, priority)
+
+    def _parse_input(self, 
+        d: dict | Chunk, 
+        prefix: Key = Key()
+    ) -> dict[Key, float]:
         data = {}
         if isinstance(d, dict):
             for k, v in d.items():
                 if isinstance(k, Term):
                     self.system.check_root(k)
                     k =  ~k
-                if k not in self.main.index:
+                if (pk := prefix * k) not in self.main.index:
                     raise ValueError(f"Unexpected key {k}")
-                data[k] = v
+                data[pk] = float(v)
         elif isinstance(d, Chunk):
             for (t1, t2), weight in d._dyads_.items():
                 if not isinstance(t1, Term) or not isinstance(t2, Term):
                     raise TypeError("Input chunk may not contain variables.")
                 key = ~t1 * ~t2
-                if key not in self.main.index:
+                if (pk := prefix * key) not in self.main.index:
                     raise ValueError(f"Unexpected dimension-value pair {key}")
-                data[key] = weight
+                data[pk] = float(weight)
         else:
             raise TypeError(f"Unexpected input of type '{type(d).__name__}'")
         return data
@@ -141,6 +173,7 @@ class Choice[D: Nodes](Stateful, Parametric):
         self.sample = State(index, {}, 0.0, l=l)
         self.by = self._init_by(d)
         self._triggers = {self.trigger}
+        self.subscribe(self.trigger)
 
     @staticmethod
     def _init_by(s: D) -> KeyForm:
@@ -259,7 +292,7 @@ class Discriminal[D: Nodes](Parametric):
 
 class Controller(Component):
     
-    input: Site = Site(lax=True)
+    input: Site = Site(lax=True, watch=ForwardUpdate)
     callbacks: dict[Key, Callable[[], Event]]
     _const: NumDict
 
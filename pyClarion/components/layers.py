@@ -6,7 +6,7 @@ from .base import Parametric, Backpropagator, Component, Priority
 from .ops import cam
 from ..knowledge import Atoms, Family, Atom, Nodes, SemanticKeySpace, Bus
 from ..events import State, Site, Event, ForwardUpdate, BackwardUpdate
-from ..numdicts import Key, KeyForm, NumDict, keyform
+from ..numdicts import Key, KeyForm, NumDict, keyform, numdict
 from ..numdicts.ops.base import Unary, Aggregator
 from ..numdicts.ops.tape import GradientTape
 
@@ -17,12 +17,16 @@ class Mapping[I: Nodes, O: Nodes](Backpropagator):
     
     Implements forward propagation of activation signals and backward 
     propagation of error signals.
+
+    If a batch sort b is given, main and input sites are indexed by members of 
+    b and each pass processes the whole batch in a single event.
     """
 
     i: I
     o: O
-    main: Site = Site()
-    input: Site = Site(lax=True)
+    b: Atoms | None
+    main: Site = Site(watch=BackwardUpdate)
+    input: Site = Site(lax=True, watch=ForwardUpdate)
     func: Unary[NumDict] | None
 
     def __init__(self, 
@@ -31,12 +35,15 @@ class Mapping[I: Nodes, O: Nodes](Backpropagator):
         o: O,
         func: Unary[NumDict] | None = None, 
         *,
+        b: Atoms | None = None,
         l: int = 1
     ) -> None:
         super().__init__(name)
         idx_in, idx_out = self._init_indexes(i, o)
+        idx_in, idx_out = self._init_batch(b, idx_in, idx_out)
         self.i = i
         self.o = o
+        self.b = b
         self.func = func
         self.main = State(idx_out, {}, 0.0)
         self.input = State(idx_in, {}, 0.0)
@@ -96,8 +103,8 @@ class Accumulator[D: Nodes](Backpropagator):
     """
 
     d: D
-    main: Site = Site()
-    input: Site = Site(lax=True)
+    main: Site = Site(watch=BackwardUpdate)
+    input: Site = Site(lax=True, watch=ForwardUpdate)
 
     def __init__(self, 
         name: str, 
@@ -172,8 +179,8 @@ class Router[I: Bus, O: Bus, D: SemanticKeySpace](Backpropagator):
     i: I
     o: O
     d: D
-    main: Site = Site()
-    input: Site = Site(lax=True)
+    main: Site = Site(watch=BackwardUpdate)
+    input: Site = Site(lax=True, watch=ForwardUpdate)
     sum_by: KeyForm
 
     def __init__(self, 
@@ -243,38 +250,60 @@ class Layer[I: Nodes, O: Nodes](Backpropagator):
     
     Implements forward propagation of activation signals and backward 
     propagation of error signals.
+
+    If a batch sort b is given, main and input sites are indexed by members of 
+    b and each forward and backward pass processes the whole batch in a single 
+    event. Weight and bias gradients are averaged over batch members present 
+    in the input.
     """
 
     i: I
     o: O
-    main: Site = Site()
-    input: Site = Site()
+    b: Atoms | None
+    main: Site = Site(watch=BackwardUpdate)
+    input: Site = Site(watch=ForwardUpdate)
     weights: Site = Site()
     bias: Site = Site()
     func: Unary[NumDict] | None
-    fw_by: KeyForm
+    fw_by: KeyForm | tuple[KeyForm, KeyForm]
     bw_by: KeyForm
+    bias_by: KeyForm | None
+    batch_by: KeyForm | None
 
     def __init__(self, 
         name: str, 
         i: I,
         o: O,
         *, 
+        b: Atoms | None = None,
         func: Unary[NumDict] | None = None, 
         l: int = 1
     ) -> None:
         super().__init__(name)
         idx_in, idx_out = self._init_indexes(i, o)
+        idx_bin, idx_bout = self._init_batch(b, idx_in, idx_out)
         self.i = i
         self.o = o
+        self.b = b
         self.func = func
-        self.main = State(idx_out, {}, 0.0)
-        self.input = State(idx_in, {}, 0.0)
+        self.main = State(idx_bout, {}, 0.0)
+        self.input = State(idx_bin, {}, 0.0)
         self.bias = State(idx_out, {}, 0.0)
         self.weights = State(idx_in * idx_out, {}, 0.0)
         self.tapes = deque([], maxlen=l)
-        self.fw_by = idx_in.kf * idx_out.kf.agg
-        self.bw_by = idx_in.kf.agg * idx_out.kf
+        if b is None:
+            self.fw_by = idx_in.kf * idx_out.kf.agg
+            self.bw_by = idx_in.kf.agg * idx_out.kf
+            self.bias_by = None
+            self.batch_by = None
+        else:
+            idx_b, = self._init_indexes(b)
+            kf_b = idx_b.kf
+            self.fw_by = (kf_b * idx_in.kf * idx_out.kf.agg, 
+                kf_b.agg * idx_in.kf * idx_out.kf)
+            self.bw_by = kf_b * idx_in.kf.agg * idx_out.kf
+            self.bias_by = kf_b.agg * idx_out.kf
+            self.batch_by = kf_b
 
     def resolve(self, event: Event) -> None:
         forward = event.index(ForwardUpdate)
@@ -291,10 +320,19 @@ class Layer[I: Nodes, O: Nodes](Backpropagator):
         """Compute and propagate forward activations."""
         input, weights, bias = self.input[0], self.weights[0], self.bias[0]
         with GradientTape() as tape:
-            main = (weights
-                .mul(input, by=self.fw_by)
-                .sum(by=self.bw_by)
-                .sum(bias))
+            if self.batch_by is None:
+                main = (weights
+                    .mul(input, by=self.fw_by)
+                    .sum(by=self.bw_by)
+                    .sum(bias))
+            else:
+                # Broadcast over batch, input and output keys; the constant 
+                # default keeps this free of stored entries.
+                ones = numdict(self.input.index * self.bias.index, {}, 1.0)
+                main = (ones
+                    .mul(input, weights, by=self.fw_by)
+                    .sum(by=self.bw_by)
+                    .sum(bias, by=self.bias_by))
             if self.func:
                 main = self.func(main)        
         self.push_tape(tape, main, [input, weights, bias])            
@@ -319,6 +357,11 @@ class Layer[I: Nodes, O: Nodes](Backpropagator):
         tape, main, args = self.tapes[-1]
         g_main = self.main.grad[0]
         g_i, g_w, g_b = tape.gradients(main, args, g_main) 
+        if self.batch_by is not None:
+            input = args[0]
+            reduce = self.batch_by.reductor(input.i.kf)
+            if 1 < (n := len({reduce(k) for k in input._d})):
+                g_w, g_b = g_w.scale(1 / n), g_b.scale(1 / n)
         return Event(self.backward,
             [BackwardUpdate(self.input, g_i),
              BackwardUpdate(self.weights, g_w, "add"),
@@ -331,6 +374,9 @@ class Pool[D: Nodes](Parametric, Backpropagator):
     An activation pooling process.
 
     Combines activation strengths from multiple sources.
+
+    If a batch sort b is given, sites are indexed by members of b and inputs 
+    are expected to be batched over the same sort.
     """
 
     class Params(Atoms):
@@ -338,7 +384,8 @@ class Pool[D: Nodes](Parametric, Backpropagator):
 
     p: Params
     d: D
-    main: Site = Site()
+    b: Atoms | None
+    main: Site = Site(watch=BackwardUpdate)
     aggregate: Site = Site()
     params: Site = Site()
     inputs: dict[Key, State]
@@ -352,13 +399,15 @@ class Pool[D: Nodes](Parametric, Backpropagator):
         *, 
         agg: Aggregator[NumDict] = cam, 
         post: Unary[NumDict] | None = None,
+        b: Atoms | None = None,
         l: int = 1
     ) -> None:
         super().__init__(name)
-        index, = self._init_indexes(d)
+        index, = self._init_batch(b, *self._init_indexes(d))
         psort, psite = self._init_sort(p, type(self).Params, l=l)
         self.p = psort
         self.d = d
+        self.b = b
         self.params = psite
         self.main = State(index, {}, 0.0, l=l)
         self.aggregate = State(index, {}, 0.0, l=l)
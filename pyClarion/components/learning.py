@@ -71,12 +71,13 @@ class TDLearning[D: Nodes, R: Nodes](LearningSignal, Choice[D]):
             data[~self.p["gamma"]] = gamma
         self.d = d
         self.r = r
+        self.subscribe(self.select)
         idx_a = self.main.index
         idx_r, = self._init_indexes(r)
         self.cost = State(idx_a, {}, c=0.0)
-        self.qvals = State(idx_a, {}, c=0.0, l=l)
-        self.actions = State(idx_a, {}, c=0.0, l=l)
-        self.reward = State(idx_r, {}, c=0.0, l=l)
+        self.qvals = State(idx_a, {}, c=0.0, l=l, ring=True)
+        self.actions = State(idx_a, {}, c=0.0, l=l, ring=True)
+        self.reward = State(idx_r, {}, c=0.0, l=l, ring=True)
         self.func = func
 
     def resolve(self, event: Event) -> None:
@@ -1,9 +1,33 @@
 from datetime import timedelta
-from typing import Sequence
+from typing import Sequence, Callable
+from dataclasses import dataclass
+from weakref import WeakSet, WeakKeyDictionary
+from math import sqrt
 
 from .base import Parametric, Priority
 from ..events import State, Site, Event, Update, ForwardUpdate, BackwardUpdate
 from ..knowledge import Family, Atoms, Atom
+from ..numdicts import Key, _Undefined
+
+
+@dataclass(slots=True)
+class StepUpdate(Update[State]):
+    """
+    A fused optimizer step on a parameter state.
+
+    Calls step on the target state when applied. Steps read gradients and 
+    hyperparameters at application time, write the new parameter values to the 
+    state once and clear its current gradient.
+    """
+    state: State
+    step: Callable[[State], None]
+
+    def apply(self) -> None:
+        self.step(self.state)
+
+    @property
+    def target(self) -> State:
+        return self.state
 
 
 class Optimizer[P: Atoms](Parametric):
@@ -11,23 +35,77 @@ class Optimizer[P: Atoms](Parametric):
     A neural network optimization process. 
 
     Issues updates to weights and biases of a collection of layers. 
+
+    Client sites are tracked by weak reference. Sites that are no longer 
+    referenced elsewhere are dropped from future updates together with any 
+    optimizer buffers associated with them.
+
+    If sync is positive, an update is automatically scheduled after every sync 
+    events delivering gradients to client sites. Gradients accumulate in client 
+    gradient buffers in the meantime. 
     """
 
     Params: type[P]
     p: P
     params: Site = Site()
-    sites: set[State]
+    sites: WeakSet[State]
+    sync: int
+    pending: int
 
-    def __init__(self, name: str, p: Family, **params: float) -> None:
+    def __init__(self, 
+        name: str, 
+        p: Family, 
+        sync: int = 0, 
+        **params: float
+    ) -> None:
         super().__init__(name)
         self.p, self.params = self._init_sort(
             p, type(self).Params, 0.0, 1, **params)
-        self.sites = set()
+        self.sites = WeakSet()
+        self.sync = sync
+        self.pending = 0
+        if sync <= 0:
+            self.subscribe()
+
+    def __getstate__(self) -> dict:
+        # Weak containers are copied and pickled as strong ones, so that their
+        # members are carried over with the optimizer.
+        state = self.__dict__.copy()
+        weak = state["__weak__"] = {}
+        for name, value in self.__dict__.items():
+            if isinstance(value, WeakSet):
+                weak[name], state[name] = WeakSet, set(value)
+            elif isinstance(value, WeakKeyDictionary):
+                weak[name], state[name] = WeakKeyDictionary, dict(value)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, cls in state.pop("__weak__").items():
+            state[name] = cls(state[name])
+        self.__dict__.update(state)
+
+    def resolve(self, event: Event) -> None:
+        if self.sync <= 0:
+            return
+        if any(s in self.sites for s in event.index(BackwardUpdate)):
+            self.pending += 1
+        if self.sync <= self.pending:
+            self.pending = 0
+            self.system.schedule(self.update(priority=Priority.DEFERRED))
 
     def add(self, *states: State) -> None:
         """Include sites in future updates."""
         self.sites.update(states)
 
+    def remove(self, *states: State) -> None:
+        """Exclude sites from future updates and release their buffers."""
+        for s in states:
+            self.sites.discard(s)
+
+    def memory(self) -> dict[State, int]:
+        """Return the number of buffered entries held for each client site."""
+        return {s: 0 for s in self.sites}
+
     def update(self, 
         dt: timedelta = timedelta(), 
         priority: Priority = Priority.LEARNING
@@ -40,6 +118,36 @@ class Optimizer[P: Atoms](Parametric):
     def state_updates(self, state: State) -> Sequence[Update]:
         raise NotImplementedError()
 
+    @staticmethod
+    def _write(state: State, delta: dict[Key, float], inplace: bool = False) \
+        -> None:
+        """
+        Add delta to current parameter data and clear current gradient.
+        
+        By default, parameter data is replaced rather than mutated b/c gradient 
+        tapes may hold references to it. If inplace is True, parameter data is 
+        mutated directly and cost scales with the size of delta only, unless 
+        it is shared or aliased (e.g., by a gradient tape), in which case it is 
+        replaced as usual.
+        """
+        w = state.data[0]
+        inplace = inplace and not (w._s or w._a)
+        c, d = w._c, w._d if inplace else w._d.copy()
+        if isinstance(c, _Undefined):
+            for k, v in delta.items():
+                if k in d:
+                    d[k] += v
+        else:
+            for k, v in delta.items():
+                d[k] = d.get(k, c) + v
+        if not inplace:
+            state.data[0] = type(w)(w._i, d, c, False)
+        # Recycle the gradient buffer evicted by rotation to avoid reallocation
+        g = state.grad[-1]
+        g._own().clear()
+        g._c = 0.0
+        state.grad.appendleft(g)
+
 
 class SGD(Optimizer):
     """
@@ -52,13 +160,22 @@ class SGD(Optimizer):
     class Params(Atoms):
         lr: Atom
 
-    def __init__(self, name: str, p: Family, *, lr: float = 1e-2) -> None:
-        super().__init__(name, p, lr=lr)
+    def __init__(self, 
+        name: str, 
+        p: Family, 
+        *, 
+        lr: float = 1e-2, 
+        sync: int = 0
+    ) -> None:
+        super().__init__(name, p, sync, lr=lr)
+
+    def state_updates(self, state: State) -> tuple[Update]:
+        return StepUpdate(state, self.step),
 
-    def state_updates(self, state: State) -> tuple[Update, Update]:
+    def step(self, state: State) -> None:
+        """Write gradient descent deltas to state."""
         lr = self.params[0][~self.p.lr]
-        delta = state.grad[-1].scale(-lr)
-        return ForwardUpdate(state, delta, "add"), BackwardUpdate(state, {})
+        self._write(state, {k: -lr * g for k, g in state.grad[-1]._d.items()})
 
 
 class Adam(Optimizer):
@@ -77,9 +194,8 @@ class Adam(Optimizer):
         bt1: Atom 
         bt2: Atom
     
-    # Maybe these should be weak key dicts?
-    m1: dict[State, State]
-    m2: dict[State, State]
+    m1: WeakKeyDictionary[State, State]
+    m2: WeakKeyDictionary[State, State]
 
     def __init__(self, 
         name: str, 
@@ -88,11 +204,13 @@ class Adam(Optimizer):
         lr: float = 1e-2,
         b1: float = 9e-1,
         b2: float = .999, 
-        ep: float = 1e-8
+        ep: float = 1e-8,
+        sync: int = 0
     ) -> None:
-        super().__init__(name, p, lr=lr, b1=b1, b2=b2, ep=ep, bt1=b1, bt2=b2)
-        self.m1 = {}
-        self.m2 = {}
+        super().__init__(name, p, sync, 
+            lr=lr, b1=b1, b2=b2, ep=ep, bt1=b1, bt2=b2)
+        self.m1 = WeakKeyDictionary()
+        self.m2 = WeakKeyDictionary()
 
     def add(self, *states: State) -> None:
         """Add states to client list."""
@@ -101,6 +219,18 @@ class Adam(Optimizer):
             self.m1[s] = State(s.index, {}, 0.0)
             self.m2[s] = State(s.index, {}, 0.0)
 
+    def remove(self, *states: State) -> None:
+        """Remove states from client list and release their moment buffers."""
+        super().remove(*states)
+        for s in states:
+            self.m1.pop(s, None)
+            self.m2.pop(s, None)
+
+    def memory(self) -> dict[State, int]:
+        """Return the number of moment entries held for each client site."""
+        return {s: len(self.m1[s][0]._d) + len(self.m2[s][0]._d) 
+            for s in self.sites}
+
     def update(self,
         dt: timedelta = timedelta(), 
         priority: Priority = Priority.LEARNING
@@ -117,27 +247,105 @@ class Adam(Optimizer):
         event.updates.append(
             ForwardUpdate(self.params,
                 {~self.p.bt1: bt1, ~self.p.bt2: bt2}, 
-                "write"))
+                "write", trusted=True))
         return event
 
-    def state_updates(self, state: State) \
-        -> tuple[Update, Update, Update, Update]:
-        lr = self.params[0][~self.p.lr]
-        b1 = self.params[0][~self.p.b1]
-        b2 = self.params[0][~self.p.b2]
-        bt1 = self.params[0][~self.p.bt1]
-        bt2 = self.params[0][~self.p.bt2]
-        ep = self.params[0][~self.p.ep]
-        m, v = self.m1[state], self.m2[state]
-        m_next = m[0].scale(b1).sum(state.grad[-1].scale(1 - b1))
-        v_next = v[0].scale(b2).sum(state.grad[-1].pow(2).scale(1 - b2))
-        m_hat = m_next.scale(1/(1 - bt1))
-        v_hat = v_next.scale(1/(1 - bt2))
-        g_hat = m_hat.div(v_hat.pow(0.5).shift(ep))
-        delta = (g_hat
-            .scale(-lr))
-        return (
-            BackwardUpdate(state, {}),
-            ForwardUpdate(state, delta, "add"),  
-            ForwardUpdate(m, m_next), 
-            ForwardUpdate(v, v_next))
+    def state_updates(self, state: State) -> tuple[Update]:
+        return StepUpdate(state, self.step),
+
+    def step(self, state: State) -> None:
+        """Update moment buffers in place and write parameter deltas."""
+        params = self.params[0]
+        lr = params[~self.p.lr]
+        b1 = params[~self.p.b1]
+        b2 = params[~self.p.b2]
+        ep = params[~self.p.ep]
+        a1 = 1 / (1 - params[~self.p.bt1])
+        a2 = 1 / (1 - params[~self.p.bt2])
+        g = state.grad[-1]._d
+        m, v = self.m1[state][0]._own(), self.m2[state][0]._own()
+        delta = {}
+        for k in {*g, *m}:
+            g_k = g.get(k, 0.0)
+            m_k = m[k] = b1 * m.get(k, 0.0) + (1 - b1) * g_k
+            v_k = v[k] = b2 * v.get(k, 0.0) + (1 - b2) * g_k * g_k
+            delta[k] = -lr * m_k * a1 / (sqrt(v_k * a2) + ep)
+        self._write(state, delta)
+
+
+class LazyAdam(Adam):
+    """
+    A lazy adaptive moment estimation process.
+
+    Issues updates to weights and biases of a collection of layers using 
+    adaptive moment estimation, touching only keys with nonzero gradients.
+
+    Moment decay for steps in which a key received no gradient is deferred 
+    until the key is next updated. Parameter data is updated in place unless a 
+    gradient tape may still hold it, so the cost of repeated steps scales with 
+    the number of active keys rather than with the size of client sites. 
+    Unlike Adam, parameters do not continue to move on 
+    momentum alone during steps in which they receive no gradient.
+    """
+
+    t: WeakKeyDictionary[State, int]
+    last: WeakKeyDictionary[State, dict[Key, int]]
+
+    def __init__(self, 
+        name: str, 
+        p: Family, 
+        *, 
+        lr: float = 1e-2,
+        b1: float = 9e-1,
+        b2: float = .999, 
+        ep: float = 1e-8,
+        sync: int = 0
+    ) -> None:
+        self.t = WeakKeyDictionary()
+        self.last = WeakKeyDictionary()
+        super().__init__(name, p, lr=lr, b1=b1, b2=b2, ep=ep, sync=sync)
+
+    def add(self, *states: State) -> None:
+        """Add states to client list."""
+        super().add(*states)
+        for s in states:
+            self.t[s] = 0
+            self.last[s] = {}
+
+    def remove(self, *states: State) -> None:
+        """Remove states from client list and release their buffers."""
+        super().remove(*states)
+        for s in states:
+            self.t.pop(s, None)
+            self.last.pop(s, None)
+
+    def memory(self) -> dict[State, int]:
+        """Return the number of buffered entries held for each client site."""
+        memory = super().memory()
+        for s in memory:
+            memory[s] += len(self.last[s])
+        return memory
+
+    def step(self, state: State) -> None:
+        """Update moments and parameters for keys in current gradient."""
+        params = self.params[0]
+        lr = params[~self.p.lr]
+        b1 = params[~self.p.b1]
+        b2 = params[~self.p.b2]
+        ep = params[~self.p.ep]
+        a1 = 1 / (1 - params[~self.p.bt1])
+        a2 = 1 / (1 - params[~self.p.bt2])
+        g = state.grad[-1]._d
+        m, v = self.m1[state][0]._own(), self.m2[state][0]._own()
+        last = self.last[state]
+        t = self.t[state] = self.t[state] + 1
+        delta = {}
+        for k, g_k in g.items():
+            if g_k == 0.0:
+                continue
+            n = t - last.get(k, t - 1)
+            m_k = m[k] = b1 ** n * m.get(k, 0.0) + (1 - b1) * g_k
+            v_k = v[k] = b2 ** n * v.get(k, 0.0) + (1 - b2) * g_k * g_k
+            last[k] = t
+            delta[k] = -lr * m_k * a1 / (sqrt(v_k * a2) + ep)
+        self._write(state, delta, inplace=True)
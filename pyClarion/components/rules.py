@@ -1,12 +1,14 @@
 from typing import Sequence
 from datetime import timedelta
+from os import PathLike
 import logging
 
 from .base import Component, Priority, ChunkUpdate, RuleUpdate
+from .base import _dump_sort, _load_sorts
 from .layers import Layer
 from ..events import State, Site, Event, ForwardUpdate
-from ..knowledge import Rules, Rule, Family, Chunks
-from ..numdicts import keyform, NumDict
+from ..knowledge import Rules, Rule, Family, Chunks, Chunk
+from ..numdicts import keyform, NumDict, NumDictWriter, NumDictFile
 from ..numdicts.ops.base import Unary
 
 
@@ -37,6 +39,7 @@ class RuleStore(Component):
         super().__init__(name)
         self.system.check_root(r, lhs, rhs)
         self.r = Rules(); r[name] = self.r
+        self.subscribe((RuleUpdate, self.r))
         self.lhs = lhs
         self.rhs = rhs
         self.b = b
@@ -52,7 +55,7 @@ class RuleStore(Component):
     def resolve(self, event: Event) -> None:
         updates = event.index(RuleUpdate).get(self.r, [])
         new_rules = [rule for ud in updates for rule in ud.add]
-        if new_rules:
+        if new_rules and event.source != self.load:
             if event.source == self.encode \
                 and self.system.logger.isEnabledFor(logging.DEBUG):
                 self.log_encoding(new_rules)
@@ -125,6 +128,48 @@ class RuleStore(Component):
              ForwardUpdate(self.rhw, rhw, "write")],
             dt, priority)
     
+    def save(self, file: str | PathLike) -> None:
+        """
+        Write rule and rule chunk names, contents and current weights to file.
+        """
+        with NumDictWriter(file) as writer:
+            writer.meta["r"] = _dump_sort(self.r)
+            writer.meta["lhs"] = _dump_sort(self.lhs)
+            writer.meta["rhs"] = _dump_sort(self.rhs)
+            for name in ("bias", "riw", "lhw", "rhw"):
+                writer.write(name, getattr(self, name)[0])
+
+    def load(self, 
+        file: str | PathLike, 
+        dt: timedelta = timedelta(), 
+        priority=Priority.LEARNING
+    ) -> Event:
+        """
+        Restore rules, rule chunks and weights saved to file by save().
+        
+        Adds saved rules and chunks missing from the store in a single update 
+        per sort and writes their weights in bulk, without recompiling rules. 
+        Restored rules and chunks carry their saved contents; constituents 
+        outside the file are looked up by key in the system root.
+        """
+        with NumDictFile(file) as f:
+            items = [(self.r, f.meta["r"], Rule), 
+                (self.lhs, f.meta["lhs"], Chunk)]
+            if self.rhs is not self.lhs:
+                items.append((self.rhs, f.meta["rhs"], Chunk))
+            rules, lhs, *rhs = _load_sorts(self.system.root, *items)
+            rhs = rhs[0] if rhs else ()
+            data = {name: f.data(name) 
+                for name in ("bias", "riw", "lhw", "rhw")}
+        updates = [
+            RuleUpdate(self.r, add=rules),
+            ChunkUpdate(self.lhs, add=lhs)]
+        if rhs:
+            updates.append(ChunkUpdate(self.rhs, add=rhs))
+        for name, d in data.items():
+            updates.append(ForwardUpdate(getattr(self, name), d, "write"))
+        return Event(self.load, updates, dt, priority)
+
     def lhs_layer(self, 
         name: str, 
         *, 
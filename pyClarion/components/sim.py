@@ -1,5 +1,14 @@
-from typing import Iterator
+from typing import Iterator, Iterable, Mapping, Sequence, Any, Callable
 from datetime import timedelta
+from contextvars import Context
+from dataclasses import dataclass
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.connection import Connection
+from statistics import fmean, stdev
+import multiprocessing as mp
+import traceback
+import random
 
 from .base import Component
 from ..events import Event, Process
@@ -24,7 +33,7 @@ class Simulation[R: Root](Component):
         """Process and yield each queued event in system."""
         while self.system.queue and self.system.clock.has_time:
             yield self.system.advance()
-    
+
     def run_all(self) -> None:
         """Process all queued events."""
         self.system.run_all()
@@ -33,11 +42,306 @@ class Simulation[R: Root](Component):
         self.system.clock.limit = limit
 
 
+class RemoteAgent:
+    """
+    A handle to an agent running in a worker process.
+
+    Created by Environment.spawn().
+    """
+
+    name: str
+    worker: mp.process.BaseProcess
+    conn: Connection
+
+    def __init__(self,
+        name: str,
+        worker: mp.process.BaseProcess,
+        conn: Connection
+    ) -> None:
+        self.name = name
+        self.worker = worker
+        self.conn = conn
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__qualname__} '{self.name}' at {hex(id(self))}>"
+
+    def send(self, until: timedelta, message: Any) -> None:
+        self.conn.send(("step", (until, message)))
+
+    def recv(self) -> Any:
+        status, payload = self.conn.recv()
+        if status == "error":
+            raise RuntimeError(f"Remote agent '{self.name}' failed:\n"
+                f"{payload}")
+        return payload
+
+    def close(self) -> None:
+        if self.worker.is_alive():
+            self.conn.send(("close", None))
+            self.worker.join()
+        self.conn.close()
+
+
+def _run_agent(
+    conn: Connection,
+    factory: Callable[..., "Agent"],
+    args: tuple,
+    kwargs: dict
+) -> None:
+    """Run an agent in a worker process, serving requests from conn."""
+    try:
+        agent = Context().run(factory, *args, **kwargs)
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+        return
+    conn.send(("ok", None))
+    while True:
+        cmd, payload = conn.recv()
+        if cmd == "close":
+            break
+        until, message = payload
+        try:
+            if message is not None:
+                agent.receive(message)
+            agent.system.run_until(until)
+            conn.send(("ok", agent.report()))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+    conn.close()
+
+
+def _inherit(agent: "Agent") -> "Agent":
+    return agent
+
+
 class Environment(Simulation):
-    """Top-level process for a multi-agent simulation."""
-    pass
+    """
+    Top-level process for a multi-agent simulation.
+
+    Agents may share the environment system or run in worker processes.
+    Remote agents are created with spawn() or branch() and advanced with
+    sync(), which runs all systems up to a common time boundary and exchanges
+    messages between the environment and remote agents at that boundary.
+    """
+
+    agents: dict[str, RemoteAgent]
+
+    def __init__(self, name: str, root: Root | None, **families: Family) \
+        -> None:
+        super().__init__(name, root, **families)
+        self.agents = {}
+
+    def spawn(self,
+        name: str,
+        factory: Callable[..., "Agent"],
+        *args: Any,
+        context: str | None = None,
+        **kwargs: Any
+    ) -> RemoteAgent:
+        """
+        Build an agent in a new worker process.
+
+        The agent is constructed by calling factory(*args, **kwargs) in the
+        worker, outside of any enclosing process context. Factory, arguments,
+        messages and reports must be picklable. Context selects the
+        multiprocessing start method.
+        """
+        if name in self.agents:
+            raise ValueError(f"Duplicate remote agent name '{name}'")
+        ctx = mp.get_context(context)
+        conn, child = ctx.Pipe()
+        worker = ctx.Process(target=_run_agent,
+            args=(child, factory, args, kwargs), daemon=True)
+        worker.start()
+        child.close()
+        agent = RemoteAgent(name, worker, conn)
+        try:
+            agent.recv()
+        except Exception:
+            agent.close()
+            raise
+        self.agents[name] = agent
+        return agent
+
+    def branch(self, name: str, agent: "Agent") -> RemoteAgent:
+        """
+        Continue a copy of a local agent in a new worker process.
+
+        The worker is started with the fork start method, so it inherits the 
+        agent as copy-on-write memory pages instead of receiving a pickled 
+        copy. The local agent is unaffected and may be branched again, e.g., to 
+        evaluate several counterfactual continuations. Requires a platform 
+        supporting fork; agents whose systems use an executor should not be 
+        branched.
+        """
+        return self.spawn(name, _inherit, agent, context="fork")
+
+    def sync(self, dt: timedelta, messages: dict[str, Any] | None = None) \
+        -> dict[str, Any]:
+        """
+        Advance all systems by dt and return reports from remote agents.
+
+        Messages are delivered to remote agents before they advance, via
+        Agent.receive(). Remote agents and the environment system run
+        concurrently up to the boundary; reports are collected from
+        Agent.report() once each agent reaches it.
+
+        Replies are collected from every remote agent before any failure is 
+        raised, so that later calls do not read stale replies. If any remote 
+        agent fails, raises a RuntimeError listing all failures.
+        """
+        messages = messages or {}
+        for name in messages:
+            if name not in self.agents:
+                raise ValueError(f"No remote agent named '{name}'")
+        until = self.system.clock.time + dt
+        for name, agent in self.agents.items():
+            agent.send(until, messages.get(name))
+        reports, failures = {}, []
+        try:
+            self.system.run_until(until)
+        finally:
+            for name, agent in self.agents.items():
+                try:
+                    reports[name] = agent.recv()
+                except RuntimeError as e:
+                    failures.append(str(e))
+                except EOFError:
+                    failures.append(f"Remote agent '{name}' closed its "
+                        "connection")
+        if failures:
+            raise RuntimeError(f"{len(failures)} remote agent(s) failed\n"
+                + "\n".join(failures))
+        return reports
+
+    def close(self) -> None:
+        """Shut down all remote agents."""
+        while self.agents:
+            _, agent = self.agents.popitem()
+            agent.close()
 
 
 class Agent(Simulation):
-    """Top-level process for a simulated agent."""
-    pass
\ No newline at end of file
+    """
+    Top-level process for a simulated agent.
+
+    Agents spawned by an Environment in worker processes communicate with it 
+    through receive() and report(), which subclasses should override.
+    """
+
+    def receive(self, message: Any) -> None:
+        """Handle a message from the environment, e.g. by scheduling inputs."""
+        raise NotImplementedError()
+
+    def report(self) -> Any:
+        """Return a picklable summary of agent output for the environment."""
+        return None
+
+
+@dataclass(slots=True)
+class Replication:
+    """The outcome of a single replication in a sweep."""
+    index: int
+    rep: int
+    seed: int
+    params: dict[str, Any]
+    result: Any
+
+
+def _replicate(
+    task: Callable[..., Any], 
+    index: int, 
+    rep: int, 
+    seed: int, 
+    params: dict[str, Any]
+) -> Replication:
+    """Run one replication with a fresh process context and seeded RNG."""
+    random.seed(seed)
+    result = Context().run(task, **params)
+    return Replication(index, rep, seed, params, result)
+
+
+class Sweep:
+    """
+    A parameter sweep over replications of a simulation.
+
+    Task is called as task(**params) once per replication for each parameter 
+    setting in grid. It should build a model (e.g., with Agent(...)), run it 
+    and return a picklable result. Each call runs in a fresh process context 
+    after seeding the random module with seed + i, where i is the call index.
+
+    Replications run on a pool of worker processes. If workers is 0, they are 
+    run sequentially in the calling process instead.
+    """
+
+    task: Callable[..., Any]
+    grid: list[dict[str, Any]]
+    reps: int
+    seed: int
+    workers: int | None
+    context: str | None
+
+    def __init__(self, 
+        task: Callable[..., Any],
+        grid: Iterable[Mapping[str, Any]] = ({},),
+        *,
+        reps: int = 1,
+        seed: int = 0,
+        workers: int | None = None,
+        context: str | None = None
+    ) -> None:
+        self.task = task
+        self.grid = [dict(params) for params in grid]
+        self.reps = reps
+        self.seed = seed
+        self.workers = workers
+        self.context = context
+
+    @staticmethod
+    def product(**values: Sequence[Any]) -> list[dict[str, Any]]:
+        """Return the full grid of parameter settings over given values."""
+        return [dict(zip(values, vs)) for vs in product(*values.values())]
+
+    def jobs(self) -> Iterator[tuple[int, int, int, dict[str, Any]]]:
+        for i, (params, rep) in enumerate(product(self.grid, range(self.reps))):
+            yield i, rep, self.seed + i, params
+
+    def run(self) -> Iterator[Replication]:
+        """Run all replications, yielding each one as soon as it completes."""
+        if self.workers == 0:
+            for job in self.jobs():
+                yield _replicate(self.task, *job)
+            return
+        ctx = mp.get_context(self.context)
+        with ProcessPoolExecutor(self.workers, mp_context=ctx) as pool:
+            futures = [pool.submit(_replicate, self.task, *job) 
+                for job in self.jobs()]
+            for future in as_completed(futures):
+                yield future.result()
+
+    @staticmethod
+    def summarize(runs: Iterable[Replication]) -> list[dict[str, Any]]:
+        """
+        Aggregate numeric results for each parameter setting.
+        
+        Results may be numbers or mappings from metric names to numbers. 
+        Returns one record per parameter setting, in order of first index, with 
+        the parameters, the number of replications and the mean and standard 
+        deviation of each metric.
+        """
+        groups: dict[int, tuple[dict[str, Any], list[Mapping[str, float]]]] = {}
+        for run in sorted(runs, key=lambda run: run.index):
+            key = run.index - run.rep
+            result = run.result
+            if not isinstance(result, Mapping):
+                result = {"result": result}
+            groups.setdefault(key, (run.params, []))[1].append(result)
+        summary = []
+        for params, results in groups.values():
+            record: dict[str, Any] = {"params": params, "n": len(results)}
+            for metric in results[0]:
+                values = [float(r[metric]) for r in results]
+                record[metric] = {"mean": fmean(values), 
+                    "std": stdev(values) if 1 < len(values) else 0.0}
+            summary.append(record)
+        return summary
@@ -26,7 +26,7 @@ class BaseLevel[D: Atoms | Chunks | Rules](Parametric):
     unit: timedelta
     ignore: set[Key]
     main: Site = Site()
-    input: Site = Site()
+    input: Site = Site(watch=ForwardUpdate)
     times: Site = Site()
     decay: Site = Site()
     scale: Site = Site()
@@ -51,6 +51,7 @@ class BaseLevel[D: Atoms | Chunks | Rules](Parametric):
         self.p = type(self).Params(); p[name] = self.p
         self.e = Atoms(prefix="e"); e[name] = self.e
         self.d = d
+        self.subscribe(self.trigger, (self._ud_type(d), d))
         idx_p = self.system.get_index(keyform(self.p))
         idx_e = self.system.get_index(keyform(self.e))
         idx_d = self.system.get_index(keyform(d))
@@ -121,10 +122,11 @@ class BaseLevel[D: Atoms | Chunks | Rules](Parametric):
         de = self.params[0][~self.p.de]
         return Event(self.invoke, 
             [AtomUpdate(self.e, add=(atom,)),
-            ForwardUpdate(self.times, {key: time}, "write"),
-            ForwardUpdate(self.scale, {key: sc}, "write"),
-            ForwardUpdate(self.decay, {key: de}, "write"),
-            ForwardUpdate(self.weights, {key * k: 1.0 for k in invoked}, "write")],
+            ForwardUpdate(self.times, {key: time}, "write", True),
+            ForwardUpdate(self.scale, {key: sc}, "write", True),
+            ForwardUpdate(self.decay, {key: de}, "write", True),
+            ForwardUpdate(self.weights, {key * k: 1.0 for k in invoked}, 
+                "write", True)],
             dt, priority)
 
     def trigger(self, 
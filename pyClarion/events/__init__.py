@@ -1,8 +1,18 @@
 from .system import Update, Event, Clock, Process
+from .system import EventQueue, HeapQueue, BucketQueue, Profiler, Timing
+from .system import EventSink
 from .sites import State, Site
 from .updates import StateUpdate, ForwardUpdate, BackwardUpdate, KeyspaceUpdate
+from .snapshot import Snapshot, snapshot, restore, save, load
+from .trace import (TraceWriter, TraceRecord, read_trace, SiteRecorder, 
+    SiteRecord, read_sites)
+from .shared import SharedSites, SharedSiteReader
 
 __all__ = [
     "Update", "Event", "Clock", "Process", "State", "Site", "StateUpdate", 
-    "ForwardUpdate", "BackwardUpdate", "KeyspaceUpdate"
+    "ForwardUpdate", "BackwardUpdate", "KeyspaceUpdate", "EventQueue", 
+    "HeapQueue", "BucketQueue", "Profiler", "Timing", "EventSink", "Snapshot", 
+    "snapshot", "restore", "save", "load", "TraceWriter", "TraceRecord", 
+    "read_trace", "SiteRecorder", "SiteRecord", "read_sites", "SharedSites", 
+    "SharedSiteReader"
 ]
\ No newline at end of file
@@ -0,0 +1,272 @@
+from typing import Any
+from datetime import timedelta
+from array import array
+from itertools import count
+from multiprocessing import shared_memory, resource_tracker
+import json
+import os
+import struct
+
+from .system import Process, Event
+from .sites import State
+from .snapshot import _sites
+from .trace import _dense
+from ..numdicts import Key
+
+
+HEADER = struct.Struct("=QqqQQQQ")
+"""Sequence, tick, resolution (µs), capacity, width, key table size, move."""
+
+
+_OWNED: set[str] = set()
+"""Names of blocks created by the current process."""
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without handing it to a resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name, track=False) # type: ignore
+    except TypeError:
+        pass
+    # Before Python 3.13, attached blocks are always tracked and unlinked when
+    # the attaching process exits (see bpo-39959). Blocks created by the 
+    # current process keep the tracking registered by their creator.
+    shm = shared_memory.SharedMemory(name)
+    if shm._name not in _OWNED: # type: ignore
+        resource_tracker.unregister(shm._name, "shared_memory") # type: ignore
+    return shm
+
+
+class _Block:
+    """A shared memory block holding the dense value of a single state."""
+
+    def __init__(self, name: str, width: int, table: int, res: int) -> None:
+        self.capacity = max(8, 2 * width)
+        self.room = max(256, 2 * table)
+        self.shm = shared_memory.SharedMemory(name, create=True,
+            size=HEADER.size + 8 * self.capacity + self.room)
+        _OWNED.add(self.shm._name) # type: ignore
+        self.values = self.shm.buf[HEADER.size:
+            HEADER.size + 8 * self.capacity].cast("d")
+        self.seq = 0
+        HEADER.pack_into(self.shm.buf, 0, 0, 0, res, self.capacity, 0, 0, 0)
+
+    def fits(self, width: int, table: int) -> bool:
+        return width <= self.capacity and table <= self.room
+
+    def close(self) -> None:
+        name = self.shm._name # type: ignore
+        self.values.release()
+        self.shm.close()
+        # Attaching processes sharing our resource tracker (e.g., spawned 
+        # children) may have unregistered the block; restore the registration 
+        # that unlink() releases.
+        resource_tracker.register(name, "shared_memory")
+        self.shm.unlink()
+        _OWNED.discard(name)
+
+
+class _SharedSite:
+    """Publisher-side bookkeeping for a single shared state."""
+
+    def __init__(self, name: str, state: State, res: int) -> None:
+        self.name = name
+        self.state = state
+        self.res = res
+        self.keys: list[Key] = list(state.index)
+        self.cols = {k: j for j, k in enumerate(self.keys)}
+        self.table = self._table()
+        self.blocks = [_Block(f"{name}_0", len(self.keys), len(self.table),
+            res)]
+
+    def _table(self) -> bytes:
+        return json.dumps(list(map(str, self.keys)),
+            separators=(",", ":")).encode()
+
+    def publish(self, tick: int) -> None:
+        d = self.state.data[0]
+        new = [k for k in d._d if k not in self.cols]
+        if new:
+            w = len(self.keys)
+            self.keys.extend(new)
+            self.cols.update((k, j) for j, k in enumerate(self.keys) if j >= w)
+            self.table = self._table()
+        row = _dense(d, self.cols, len(self.keys))
+        block = self.blocks[-1]
+        if not block.fits(len(row), len(self.table)):
+            gen = len(self.blocks)
+            new_block = _Block(f"{self.name}_{gen}", len(row),
+                len(self.table), self.res)
+            self._write(new_block, tick, row)
+            self._write(block, tick, None, gen)
+            self.blocks.append(new_block)
+        else:
+            self._write(block, tick, row)
+
+    def _write(self,
+        block: _Block, tick: int, row: list[float] | None, moved: int = 0
+    ) -> None:
+        buf = block.shm.buf
+        block.seq += 1
+        struct.pack_into("=Q", buf, 0, block.seq)
+        w = 0
+        if row is not None:
+            w = len(row)
+            block.values[:w] = array("d", row)
+            start = HEADER.size + 8 * block.capacity
+            buf[start:start + len(self.table)] = self.table
+        block.seq += 1
+        HEADER.pack_into(buf, 0, block.seq, tick, self.res, block.capacity,
+            w, len(self.table), moved)
+
+    def close(self) -> None:
+        for block in self.blocks:
+            block.close()
+        self.blocks.clear()
+
+
+class SharedSites:
+    """
+    Publishes the values of chosen sites in shared memory.
+
+    Each state is backed by a shared memory block holding its current value
+    as a dense float64 array in key table order, along with the key table
+    itself. The key table initially lists members of the state index in
+    index order; keys later appearing in state data are appended. Values of
+    keys not explicitly stored are set to the default constant, or NaN if it
+    is Undefined. Blocks are updated after each processed event that updates
+    their state.
+
+    Blocks are named by prefix (default: 'pycl', the process id and a 
+    per-process instance count) and the position of the state among given 
+    states. If a block outgrows its
+    capacity, it is replaced by a new generation and marked as moved;
+    SharedSiteReader instances follow such moves. Blocks are unlinked on
+    close().
+
+    Observers in other local processes attach to blocks listed in names using
+    SharedSiteReader.
+    """
+
+    system: Process.System
+    names: dict[str, str]
+    """Block names keyed by site name (e.g., 'choice.main')."""
+    _ids = count()
+
+    def __init__(self,
+        system: Process.System,
+        *states: State,
+        prefix: str | None = None
+    ) -> None:
+        if prefix is None:
+            prefix = f"pycl{os.getpid()}_{next(type(self)._ids)}"
+        res = system.clock.res // timedelta(microseconds=1)
+        labels: dict[State, str] = {}
+        for proc in system.procs:
+            for name, state in _sites(proc):
+                labels.setdefault(state, f"{proc.name}.{name}")
+        self.system = system
+        self.sites = {s: _SharedSite(f"{prefix}_{i}", s, res)
+            for i, s in enumerate(states)}
+        self.names = {labels.get(s, repr(s)): f"{site.name}_0"
+            for s, site in self.sites.items()}
+        for site in self.sites.values():
+            site.publish(system.clock.tick)
+
+    def __enter__(self) -> "SharedSites":
+        self.attach()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def attach(self) -> None:
+        """Start publishing sites updated by events processed by system."""
+        self.system.sinks.append(self)
+
+    def close(self) -> None:
+        """Stop publishing and unlink all shared memory blocks."""
+        if self in self.system.sinks:
+            self.system.sinks.remove(self)
+        for site in self.sites.values():
+            site.close()
+
+    def write(self, event: Event) -> None:
+        """Publish states targeted by updates in event."""
+        sites, done = self.sites, set()
+        for ud in event.updates:
+            site = sites.get(ud.target)
+            if site is None or site in done:
+                continue
+            done.add(site)
+            site.publish(event.tick)
+
+
+class SharedSiteReader:
+    """
+    Reads a state published by SharedSites from another process.
+
+    The view() method exposes current values without copying; values may
+    change while they are being read, and views must be released before the
+    reader is closed. The read() method returns a consistent copy of the most
+    recently published value.
+    """
+
+    name: str
+
+    def __init__(self, name: str) -> None:
+        self._open(name)
+
+    def _open(self, name: str) -> None:
+        self.name = name
+        self.shm = _attach(name)
+        self._table: tuple[int, list[Key]] = (-1, [])
+
+    def _header(self) -> tuple[int, ...]:
+        while True:
+            header = HEADER.unpack_from(self.shm.buf, 0)
+            if not header[6]:
+                return header
+            base = self.name.rsplit("_", 1)[0]
+            self.close()
+            self._open(f"{base}_{header[6]}")
+
+    @property
+    def keys(self) -> list[Key]:
+        """Keys of published values, in order."""
+        return self._read()[2]
+
+    def view(self) -> memoryview:
+        """Return a live float64 view of published values."""
+        w = self._header()[4]
+        return self.shm.buf[HEADER.size:HEADER.size + 8 * w].cast("d")
+
+    def read(self) -> tuple[timedelta, dict[Key, float]]:
+        """Return the time and value of the most recent publication."""
+        time, values, keys = self._read()
+        return time, dict(zip(keys, values))
+
+    def _read(self) -> tuple[timedelta, list[float], list[Key]]:
+        while True:
+            seq, tick, res, cap, w, n, _ = self._header()
+            if seq % 2:
+                continue
+            buf = self.shm.buf
+            values = list(struct.unpack_from(f"={w}d", buf, HEADER.size))
+            table = self._table
+            if table[0] != n:
+                start = HEADER.size + 8 * cap
+                table = (n, [Key(k) for k in
+                    json.loads(bytes(buf[start:start + n]))])
+            if struct.unpack_from("=Q", buf, 0)[0] == seq:
+                self._table = table
+                return tick * timedelta(microseconds=res), values, table[1]
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def __enter__(self) -> "SharedSiteReader":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
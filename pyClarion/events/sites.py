@@ -1,23 +1,40 @@
-from typing import Iterator
+from typing import Iterator, Any
 from math import isnan
 from collections import deque
 
 from .system import Process
-from ..numdicts import Index, NumDict, _Undefined, numdict
+from ..numdicts import Index, NumDict, Key, _Undefined, numdict
 
 
 class State:
-    """A simulated process state."""
+    """
+    A simulated process state.
+    
+    If ring is True, the data and grad channels act as ring buffers: pushes 
+    refill the numdict evicted from the channel in place instead of 
+    allocating a new one. Numdicts read from a ring buffered state remain 
+    valid only until l further pushes to the same channel, so ring buffering 
+    must not be used for states read under gradient tapes or otherwise 
+    retained by readers.
+    """
 
     index: Index
     const: float | _Undefined
     data: deque[NumDict]
     grad: deque[NumDict]
+    ring: bool
 
-    def __init__(self, i: Index, d: dict, c: float | _Undefined, l: int = 1) -> None:
+    def __init__(self, 
+        i: Index, 
+        d: dict, 
+        c: float | _Undefined, 
+        l: int = 1, 
+        ring: bool = False
+    ) -> None:
         l = 1 if l < 1 else l
         self.index = i
         self.const = c
+        self.ring = ring
         self.data = deque([numdict(i, d, c) for _ in range(l)], maxlen=l)
         self.grad = deque([numdict(i, {}, 0.0) for _ in range(l)], maxlen=l)
 
@@ -33,10 +50,38 @@ class State:
     def new(self, d: dict, c: float | None = None) -> NumDict:
         return numdict(self.index, d, self.const if c is None else c)
 
+    def push(self, channel: deque[NumDict], d: dict) -> None:
+        """Push a new value with data d onto channel (data or grad)."""
+        if not self.ring:
+            channel.appendleft(self.new(d))
+            return
+        index = self.index
+        for k in d:
+            if Key(k) not in index:
+                raise ValueError(f"Key {k} not a member of index")
+        buffer = channel[-1]
+        data = buffer._own()
+        data.clear()
+        for k, v in d.items():
+            data[Key(k)] = float(v)
+        buffer._c = self.const
+        channel.appendleft(buffer)
+
 
 class Site:
-    def __init__(self, lax: bool = False) -> None:
+    """
+    A process data site.
+
+    If watch is given, owning processes subscribe to updates of the listed 
+    types targeting the current site value. Subscriptions follow site 
+    reassignment.
+    """
+
+    def __init__(
+        self, lax: bool = False, watch: type | tuple[type, ...] = ()
+    ) -> None:
         self.lax = lax
+        self.watch = watch if isinstance(watch, tuple) else (watch,)
 
     def __set_name__(self, owner: Process, name: str) -> None:
         self._name = "_" + name
@@ -47,7 +92,15 @@ class Site:
 
     def __set__(self, obj: Process, value: State) -> None:
         self.validate(obj, value)
+        old = getattr(obj, self._name, None)
         setattr(obj, self._name, value)
+        if self.watch:
+            if old is not None:
+                obj.unsubscribe(*self._keys(old))
+            obj.subscribe(*self._keys(value))
+
+    def _keys(self, value: State) -> list[tuple[type, Any]]:
+        return [(ud_type, value) for ud_type in self.watch]
 
     def validate(self, obj: Process, value: State) -> None:
         old = getattr(obj, self._name, None)
@@ -0,0 +1,418 @@
+from typing import Any, BinaryIO, Iterator
+from datetime import timedelta
+from collections import deque
+from weakref import WeakKeyDictionary
+from itertools import count
+from array import array
+from inspect import ismethod
+from dataclasses import fields, is_dataclass
+from importlib import import_module
+from os import PathLike
+import mmap
+import json
+import struct
+
+from .system import Process, Event, Update
+from .sites import State, Site
+from .updates import StateUpdate, KeyspaceUpdate
+from ..numdicts import Key, numdict, Undefined
+from ..numdicts.keyspaces import KSParent, KSRoot
+from ..knowledge import Sort, Compound
+from ..knowledge.serial import _dump_compound, _load_compounds
+
+
+MAGIC = b"PYCLSNP1"
+HEADER = struct.Struct("=8sQQ")
+
+
+class Snapshot:
+    """
+    A simulation state snapshot.
+
+    Stores keyspace structure, site data and gradients, queued events and
+    clock state of a system. Numeric payloads are stored as two contiguous,
+    parallel arrays of int64 key ids and float64 values in native byte order, 
+    preceded by a JSON header describing the layout. Snapshots loaded from disk expose these
+    arrays as zero-copy views over a memory map.
+
+    Per-site buffers that processes hold in weak key dictionaries keyed by 
+    sites (e.g., optimizer moments and step counts) are captured along with 
+    sites, as are the contents of compound terms and pending updates. Other 
+    process-internal attributes (e.g., gradient tapes) are not captured. 
+    Restoration expects a system built by the same model construction code.
+    """
+
+    meta: dict[str, Any]
+    keys: memoryview
+    vals: memoryview
+    table: list[Key]
+
+    def __init__(self, 
+        meta: dict[str, Any], 
+        keys: memoryview, 
+        vals: memoryview
+    ) -> None:
+        self.meta = meta
+        self.keys = keys
+        self.vals = vals
+        self.table = [Key(s) for s in meta["keys"]]
+
+    def payload(self, spec: list) -> tuple[dict[Key, float], Any]:
+        """Decode a payload spec into a data dict and default constant."""
+        offset, n, c = spec
+        table = self.table
+        keys = self.keys[offset:offset + n]
+        vals = self.vals[offset:offset + n]
+        return ({table[k]: v for k, v in zip(keys, vals)},
+            Undefined if c is None else c)
+
+    def write(self, f: BinaryIO) -> None:
+        meta = json.dumps(self.meta, separators=(",", ":")).encode()
+        n = len(self.vals)
+        f.write(HEADER.pack(MAGIC, len(meta), n))
+        f.write(meta)
+        f.write(b"\0" * (-(HEADER.size + len(meta)) % 8))
+        f.write(self.keys.cast("B"))
+        f.write(self.vals.cast("B"))
+
+    @classmethod
+    def read(cls, f: BinaryIO) -> "Snapshot":
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, m, n = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError("Not a pyClarion snapshot")
+        meta = json.loads(buf[HEADER.size:HEADER.size + m])
+        start = HEADER.size + m
+        start += -start % 8
+        view = memoryview(buf)
+        keys = view[start:start + 8 * n].cast("q")
+        vals = view[start + 8 * n:start + 16 * n].cast("d")
+        return cls(meta, keys, vals)
+
+
+class _Encoder:
+    """Accumulates payload arrays and the key table for a snapshot."""
+
+    def __init__(self) -> None:
+        self.table: dict[Key, int] = {}
+        self.keys = array("q")
+        self.vals = array("d")
+
+    def payload(self, d: dict[Key, float], c: Any) -> list:
+        offset = len(self.vals)
+        table = self.table
+        for k, v in d.items():
+            self.keys.append(table.setdefault(k, len(table)))
+            self.vals.append(v)
+        return [offset, len(d), None if c is Undefined else c]
+
+
+def _cls_path(obj: Any) -> str:
+    cls = type(obj)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _load_cls(path: str) -> type:
+    module, qualname = path.split(":")
+    obj: Any = import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _sites(proc: Process) -> Iterator[tuple[str, State]]:
+    seen = set()
+    for cls in type(proc).__mro__:
+        for name, attr in vars(cls).items():
+            if not isinstance(attr, Site) or name in seen:
+                continue
+            seen.add(name)
+            try:
+                yield name, getattr(proc, name)
+            except AttributeError:
+                continue
+
+
+def _nodes(root: KSRoot) -> Iterator[tuple[int, str, Any]]:
+    """
+    Yield (parent, name, node) for nodes under root in depth-first order.
+    
+    Parents are identified by their position in the output, or -1 for root.
+    """
+    stack = [(-1, child) for child in reversed(root._members_.values())]
+    i = 0
+    while stack:
+        parent, node = stack.pop()
+        yield parent, node._name_, node
+        if isinstance(node, KSParent):
+            stack.extend((i, child) 
+                for child in reversed(node._members_.values()))
+        i += 1
+
+
+def snapshot(system: Process.System) -> Snapshot:
+    """Capture the current state of system."""
+    enc = _Encoder()
+    nodes = []
+    for parent, name, node in _nodes(system.root):
+        entry: dict[str, Any] = {"p": parent, "n": name, "t": _cls_path(node)}
+        if isinstance(node, Sort):
+            n = entry["c"] = next(node._counter_)
+            node._counter_ = count(n)
+        if isinstance(node, Compound):
+            entry["x"] = _dump_compound(node)
+        nodes.append(entry)
+    sites = {}
+    states = {}
+    for proc in system.procs:
+        for name, state in _sites(proc):
+            if id(state) in states:
+                continue
+            states[id(state)] = (proc.name, name)
+            sites.setdefault(proc.name, {})[name] = _encode_state(state, enc)
+    buffers = {}
+    for proc in system.procs:
+        for name, value in vars(proc).items():
+            if isinstance(value, WeakKeyDictionary):
+                buffers.setdefault(proc.name, {})[name] = \
+                    _encode_buffer(value, states, enc)
+    events = []
+    for event in sorted(system.queue):
+        source = event.source
+        if not (ismethod(source) and source.__self__ in system.ranks):
+            raise ValueError(f"Cannot snapshot event from source {source}")
+        updates = []
+        for ud in event.updates:
+            updates.append(_encode_update(ud, system, states, enc))
+        events.append({"s": [source.__self__.name, source.__name__],
+            "t": event.tick, "p": event.priority, "n": event.number,
+            "u": updates})
+    clock = system.clock
+    n = next(clock.counter)
+    clock.counter = count(n)
+    meta = {
+        "keys": [str(k) for k in enc.table],
+        "nodes": nodes,
+        "sites": sites,
+        "buffers": buffers,
+        "events": events,
+        "clock": {"res": clock.res // timedelta(microseconds=1),
+            "tick": clock.tick, "horizon": clock.horizon, "counter": n}}
+    return Snapshot(meta, memoryview(enc.keys), memoryview(enc.vals))
+
+
+def _encode_state(state: State, enc: _Encoder) -> dict:
+    return {"data": [enc.payload(d._d, d._c) for d in state.data],
+        "grad": [enc.payload(g._d, g._c) for g in state.grad]}
+
+
+def _encode_buffer(
+    buffer: WeakKeyDictionary, states: dict, enc: _Encoder
+) -> list:
+    entries = []
+    for state, value in buffer.items():
+        if id(state) not in states:
+            raise ValueError("Cannot snapshot buffer keyed by unregistered "
+                "state")
+        if isinstance(value, State):
+            entry = {"s": _encode_state(value, enc)}
+        elif isinstance(value, (int, float)):
+            entry = {"v": value}
+        elif isinstance(value, dict) and all(isinstance(k, Key) and 
+            isinstance(v, (int, float)) for k, v in value.items()):
+            entry = {"d": [[str(k), v] for k, v in value.items()]}
+        else:
+            raise ValueError(f"Cannot snapshot buffer value of type "
+                f"{type(value).__name__}")
+        entry["k"] = states[id(state)]
+        entries.append(entry)
+    return entries
+
+
+def _encode_update(
+    ud: Update, system: Process.System, states: dict, enc: _Encoder
+) -> dict:
+    if isinstance(ud, StateUpdate):
+        if id(ud.state) not in states:
+            raise ValueError("Cannot snapshot update to unregistered state")
+        data = ud.data
+        assert isinstance(data, dict)
+        return {"t": _cls_path(ud), "s": states[id(ud.state)], "m": ud.method,
+            "d": enc.payload(data, ud.state.const), "tr": ud.trusted}
+    if isinstance(ud, KeyspaceUpdate):
+        add = []
+        for c in ud.add:
+            x = _dump_compound(c) if isinstance(c, Compound) else None
+            add.append([_cls_path(c), getattr(c, "_name_", None), x])
+        return {"t": _cls_path(ud), "k": str(~ud.node), "a": add,
+            "r": list(ud.remove)}
+    if is_dataclass(ud):
+        # Other updates (e.g., optimizer steps) are captured as references 
+        # to registered states and process methods, without payload.
+        f = {}
+        for field in fields(ud):
+            value = getattr(ud, field.name)
+            if isinstance(value, State) and id(value) in states:
+                f[field.name] = {"s": states[id(value)]}
+            elif ismethod(value) and value.__self__ in system.ranks:
+                f[field.name] = {"m": [value.__self__.name, value.__name__]}
+            else:
+                break
+        else:
+            return {"t": _cls_path(ud), "f": f}
+    raise ValueError(f"Cannot snapshot update of type {type(ud).__name__}")
+
+
+def restore(system: Process.System, snap: Snapshot) -> None:
+    """Restore state captured in snap into a structurally identical system."""
+    meta = snap.meta
+    procs = {proc.name: proc for proc in system.procs}
+    _restore_nodes(system.root, meta["nodes"])
+    for pname, sites in meta["sites"].items():
+        proc = procs[pname]
+        for name, channels in sites.items():
+            _restore_state(getattr(proc, name), channels, snap)
+    for pname, buffers in meta.get("buffers", {}).items():
+        proc = procs[pname]
+        for name, entries in buffers.items():
+            _restore_buffer(getattr(proc, name), entries, procs, snap)
+    clock = meta["clock"]
+    system.clock.res = timedelta(microseconds=clock["res"])
+    system.clock.tick = clock["tick"]
+    system.clock.horizon = clock["horizon"]
+    system.clock.counter = count(clock["counter"])
+    queue = type(system.queue)()
+    system.pending.clear()
+    compounds: tuple[dict, list] = ({}, [])
+    for entry in meta["events"]:
+        pname, method = entry["s"]
+        source = getattr(procs[pname], method)
+        updates = [_decode_update(ud, procs, system, snap, compounds) 
+            for ud in entry["u"]]
+        event = Event(source, updates, priority=entry["p"], number=entry["n"])
+        event.tick = entry["t"]
+        event.res = system.clock.res
+        event.scheduled = True
+        queue.push(event)
+        system.pending[source] = system.pending.get(source, 0) + 1
+    _load_compounds(system.root, *compounds)
+    system.queue = queue
+
+
+def _restore_state(state: State, channels: dict, snap: Snapshot) -> None:
+    for attr in ("data", "grad"):
+        specs = channels[attr]
+        d = deque(maxlen=len(specs))
+        for spec in specs:
+            data, c = snap.payload(spec)
+            d.append(numdict(state.index, data, c))
+        setattr(state, attr, d)
+
+
+def _restore_buffer(
+    buffer: WeakKeyDictionary, 
+    entries: list[dict], 
+    procs: dict[str, Process], 
+    snap: Snapshot
+) -> None:
+    for entry in entries:
+        pname, site = entry["k"]
+        state = getattr(procs[pname], site)
+        if "s" in entry:
+            value = buffer.get(state)
+            if not isinstance(value, State):
+                value = buffer[state] = State(state.index, {}, 0.0)
+            _restore_state(value, entry["s"], snap)
+        elif "v" in entry:
+            buffer[state] = entry["v"]
+        else:
+            buffer[state] = {Key(k): v for k, v in entry["d"]}
+
+
+def _decode_update(
+    entry: dict, 
+    procs: dict[str, Process], 
+    system: Process.System, 
+    snap: Snapshot,
+    compounds: tuple[dict, list]
+) -> Update:
+    """
+    Decode an update entry.
+    
+    Pending compound terms are returned as placeholders and registered in 
+    compounds for restoration once all pending updates are decoded.
+    """
+    cls = _load_cls(entry["t"])
+    if "s" in entry:
+        pname, site = entry["s"]
+        data, _ = snap.payload(entry["d"])
+        return cls(getattr(procs[pname], site), data, entry["m"], 
+            entry.get("tr", False))
+    if "f" in entry:
+        kwargs = {}
+        for name, spec in entry["f"].items():
+            pname, attr = spec["s"] if "s" in spec else spec["m"]
+            kwargs[name] = getattr(procs[pname], attr)
+        return cls(**kwargs)
+    node: Any = system.root
+    for label, _ in Key(entry["k"])[1:]:
+        node = node[label]
+    new, records = compounds
+    add = []
+    for path, name, x in entry["a"]:
+        child = _load_cls(path)()
+        if name is not None:
+            child._name_ = name
+            new[f"{~node}:{name}"] = child
+        if x is not None:
+            records.append((child, x))
+        add.append(child)
+    return cls(node, tuple(add), tuple(entry["r"]))
+
+
+def _restore_nodes(root: KSRoot, entries: list[dict]) -> None:
+    nodes: list[Any] = []
+    saved: dict[int, set[str]] = {}
+    records = []
+    for entry in entries:
+        p, name = entry["p"], entry["n"]
+        parent = root if p < 0 else nodes[p]
+        saved.setdefault(id(parent), set()).add(name)
+        try:
+            node = parent[name]
+        except KeyError:
+            node = _load_cls(entry["t"])()
+            parent[name] = node
+            if "x" in entry:
+                records.append((node, entry["x"]))
+        if isinstance(node, Sort) and "c" in entry:
+            node._counter_ = count(entry["c"])
+            node._namer_ = node._name_generator_()
+        nodes.append(node)
+    _load_compounds(root, {}, records)
+    stack: list[Any] = [root]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, KSParent):
+            continue
+        names = saved.get(id(node), set())
+        required = getattr(node, "_required_", frozenset())
+        for key, child in list(node._members_.items()):
+            name = child._name_
+            if name not in names and key not in required:
+                del node[name]
+            else:
+                stack.append(child)
+
+
+def save(system: Process.System, file: str | PathLike) -> None:
+    """Write a snapshot of system to file."""
+    with open(file, "wb") as f:
+        snapshot(system).write(f)
+
+
+def load(system: Process.System, file: str | PathLike) -> None:
+    """Restore system from a snapshot file."""
+    with open(file, "rb") as f:
+        snap = Snapshot.read(f)
+    restore(system, snap)
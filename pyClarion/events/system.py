@@ -1,18 +1,26 @@
-from typing import Callable, Protocol, Hashable, cast
-from contextvars import ContextVar, Token
+from typing import (Callable, Protocol, Hashable, Iterator, Iterable, ClassVar, 
+    Self, Any, cast)
+from contextvars import ContextVar, Token, copy_context
 from dataclasses import dataclass, field
 from datetime import timedelta
 from inspect import ismethod
 from itertools import count
+from collections import deque
+from copy import deepcopy
+from concurrent.futures import Executor, ProcessPoolExecutor
 from enum import IntEnum
+from os import PathLike
+from time import perf_counter
 import logging
 import heapq
+import csv
 
 from ..numdicts import Key, KeyForm, Index, ks_root
 from ..numdicts.keyspaces import KSRoot, KSPath
 
 
 PROCESS: ContextVar["Process"] = ContextVar("PROCESS")
+SCHEDULED: ContextVar[list["Event"]] = ContextVar("SCHEDULED")
 
 
 class Update[I: Hashable](Protocol):
@@ -22,35 +30,76 @@ class Update[I: Hashable](Protocol):
     @property
     def target(self) -> I:
         ...
+    def coalesce(self, other: "Update") -> "Update | None":
+        """
+        Return an update equivalent to applying self, then other.
+        
+        Other is guaranteed to be of the same type and to have the same target 
+        as self. Return None if no such update exists.
+
+        Updates that do not override this method are never coalesced and are 
+        never reordered with respect to other updates in the same batch.
+        """
+        return None
 
 
-@dataclass(slots=True)
 class Event:
     """
     A simulation event.
     
     Events are ordered first by time, then by priority, then by number.
 
+    Event time is given relative to scheduling time. Once scheduled, event time 
+    is stored as an integer clock tick and event.time reports the absolute 
+    event time.
+
     Do not directly mutate the updates list as this will corrupt the event, use 
     event.append() instead.
 
     Do not mutate any event attribute if the event is marked as scheduled.
     """
+
+    __slots__ = ("source", "updates", "priority", "number", "scheduled", 
+        "tick", "res", "_dt", "_index")
+
     source: Callable
     updates: list[Update]
-    time: timedelta = timedelta()
-    priority: int = 0
-    number: int = 0
-    scheduled: bool = False
-    _index: dict[type[Update], dict[Hashable, list[Update]]] = field(init=False)
-
-    def __post_init__(self) -> None:
-        self._index = {}
-        for ud in self.updates:
-            (self._index
-                .setdefault(type(ud), dict())
-                .setdefault(ud.target, [])
-                .append(ud))
+    priority: int
+    number: int
+    scheduled: bool
+    tick: int
+    res: timedelta
+    _dt: timedelta
+    _index: dict[type[Update], dict[Hashable, list[Update]]] | None
+
+    def __init__(self, 
+        source: Callable, 
+        updates: list[Update], 
+        time: timedelta = timedelta(), 
+        priority: int = 0, 
+        number: int = 0, 
+        scheduled: bool = False
+    ) -> None:
+        self.source = source
+        self.updates = updates
+        self.priority = priority
+        self.number = number
+        self.scheduled = scheduled
+        self.tick = 0
+        self._dt = time
+        self._index = None
+
+    @property
+    def time(self) -> timedelta:
+        if self.scheduled:
+            return self.tick * self.res
+        return self._dt
+
+    @time.setter
+    def time(self, value: timedelta) -> None:
+        if self.scheduled:
+            raise ValueError("Cannot set time of scheduled event")
+        self._dt = value
 
     def __repr__(self) -> str:
         if ismethod(self.source) and isinstance(self.source.__self__, Process):
@@ -63,11 +112,7 @@ class Event:
     
     def append(self, *updates) -> None:
         self.updates.extend(updates)
-        for ud in updates:
-            (self._index
-                .setdefault(type(ud), dict())
-                .setdefault(ud.target, [])
-                .append(ud))
+        self._index = None
     
     def describe(self) -> str:
         if ismethod(self.source) and isinstance(self.source.__self__, Process):
@@ -85,29 +130,92 @@ class Event:
     
     def index[U: Update](self, update_type: type[U]) \
         -> dict[Hashable, list[U]]:
-        return cast(dict[Hashable, list[U]], self._index.get(update_type, {}))
+        """
+        Return updates of the given type in event, grouped by target.
+        
+        The index is built on first call and cached. Single-update events 
+        are not indexed for queries on update types they do not contain.
+        """
+        index = self._index
+        if index is None:
+            updates = self.updates
+            if len(updates) == 1 and type(updates[0]) is not update_type:
+                return {}
+            index = self._index = {}
+            for ud in updates:
+                (index
+                    .setdefault(type(ud), dict())
+                    .setdefault(ud.target, [])
+                    .append(ud))
+        return cast(dict[Hashable, list[U]], index.get(update_type, {}))
 
     def __lt__(self, other) -> bool:
         if isinstance(other, Event):
-            if self.time == other.time:
+            if self.tick == other.tick:
                 if self.priority == other.priority:
                     return self.number < other.number
                 return self.priority > other.priority
-            return self.time < other.time
+            return self.tick < other.tick
         return NotImplemented
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, init=False)
 class Clock:
     """
     A simulation clock.
     
-    Tracks simulation time using datetime.timedelta() objects.
+    Tracks simulation time as an integer number of ticks, each of duration res 
+    (default: 1 microsecond). Durations are truncated to whole ticks. Time and 
+    limit are exposed as datetime.timedelta() objects and may be given on 
+    construction or assigned directly.
+
+    To change the resolution, replace the system clock with a new one before 
+    scheduling any events.
     """
-    time: timedelta = timedelta()
-    limit: timedelta = timedelta()
+    res: timedelta
+    tick: int
+    horizon: int
     counter: count = field(default_factory=count)
 
+    def __init__(self, 
+        time: timedelta = timedelta(), 
+        limit: timedelta = timedelta(), 
+        counter: count | None = None, 
+        *, 
+        res: timedelta = timedelta(microseconds=1)
+    ) -> None:
+        if res <= timedelta():
+            raise ValueError("Clock resolution must be positive")
+        self.res = res
+        self.tick = self.ticks(time)
+        self.horizon = self.ticks(limit)
+        self.counter = count() if counter is None else counter
+
+    def __getstate__(self) -> tuple[timedelta, int, int, int]:
+        n = next(self.counter)
+        self.counter = count(n)
+        return self.res, self.tick, self.horizon, n
+
+    def __setstate__(self, state: tuple[timedelta, int, int, int]) -> None:
+        self.res, self.tick, self.horizon, n = state
+        self.counter = count(n)
+
+    @property
+    def time(self) -> timedelta:
+        return self.tick * self.res
+
+    @time.setter
+    def time(self, value: timedelta) -> None:
+        self.tick = self.ticks(value)
+
+    @property
+    def limit(self) -> timedelta:
+        return self.horizon * self.res
+
+    @limit.setter
+    def limit(self, value: timedelta) -> None:
+        self.horizon = self.ticks(value)
+
     @property
     def has_time(self) -> bool:
         """
@@ -115,20 +223,282 @@ class Clock:
         
         If self.limit == timedelta(), always returns True.
         """
-        return not self.limit or self.time <= self.limit
+        return not self.horizon or self.tick <= self.horizon
+
+    def ticks(self, duration: timedelta) -> int:
+        """Convert a duration to a whole number of clock ticks."""
+        return duration // self.res
 
-    def advance(self, timepoint: timedelta) -> None:
+    def advance(self, timepoint: timedelta | int) -> None:
         """
         Advance clock to given timepoint.
+
+        Integer timepoints are interpreted as clock ticks.
         
         Raises StopIteration if a time limit is set and timepoint is beyond it 
         and ValueError if timepoint precedes clock time.
         """
-        if timedelta() < self.limit and self.limit < timepoint:
+        tick = timepoint if isinstance(timepoint, int) \
+            else self.ticks(timepoint)
+        if 0 < self.horizon and self.horizon < tick:
             raise StopIteration("Timepoint beyond time limit")
-        if timepoint < self.time:
+        if tick < self.tick:
             raise ValueError("Timepoint precedes current time")
-        self.time = timepoint
+        self.tick = tick
+
+
+class EventSink(Protocol):
+    """A consumer of processed events."""
+    def write(self, event: Event) -> None:
+        ...
+
+
+class EventQueue(Protocol):
+    """A priority queue of scheduled events."""
+    def push(self, event: Event) -> None:
+        ...
+    def pop(self) -> Event:
+        ...
+    def peek(self) -> Event:
+        ...
+    def __len__(self) -> int:
+        ...
+    def __iter__(self) -> Iterator[Event]:
+        ...
+
+
+class HeapQueue:
+    """
+    A binary heap of scheduled events.
+    
+    Events are ordered according to Event.__lt__(). Iteration is unordered.
+    """
+
+    heap: list[Event]
+
+    def __init__(self) -> None:
+        self.heap = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__qualname__}({self.heap!r})"
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __iter__(self) -> Iterator[Event]:
+        yield from self.heap
+
+    def push(self, event: Event) -> None:
+        heapq.heappush(self.heap, event)
+
+    def pop(self) -> Event:
+        return heapq.heappop(self.heap)
+
+    def peek(self) -> Event:
+        return self.heap[0]
+
+
+class BucketQueue:
+    """
+    A calendar queue of scheduled events.
+
+    Events are bucketed by clock tick, then by priority. Each bucket is a FIFO 
+    queue, which preserves event number order as numbers are assigned on 
+    scheduling. Enqueuing at an existing time and priority takes constant time; 
+    heap operations are only needed for new timepoints and priority levels. 
+    
+    Yields the same event order as HeapQueue. Iteration is unordered.
+    """
+
+    times: list[int]
+    buckets: dict[int, tuple[list[int], dict[int, deque[Event]]]]
+    size: int
+
+    def __init__(self) -> None:
+        self.times = []
+        self.buckets = {}
+        self.size = 0
+
+    def __repr__(self) -> str:
+        return f"{type(self).__qualname__}({list(self)!r})"
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Event]:
+        for _, levels in self.buckets.values():
+            for events in levels.values():
+                yield from events
+
+    def push(self, event: Event) -> None:
+        time, priority = event.tick, event.priority
+        try:
+            ranks, levels = self.buckets[time]
+        except KeyError:
+            ranks, levels = self.buckets[time] = ([], {})
+            heapq.heappush(self.times, time)
+        try:
+            levels[priority].append(event)
+        except KeyError:
+            levels[priority] = deque([event])
+            heapq.heappush(ranks, -priority)
+        self.size += 1
+
+    def pop(self) -> Event:
+        if not self.size:
+            raise IndexError("pop from empty queue")
+        time = self.times[0]
+        ranks, levels = self.buckets[time]
+        priority = -ranks[0]
+        events = levels[priority]
+        event = events.popleft()
+        if not events:
+            del levels[priority]
+            heapq.heappop(ranks)
+            if not ranks:
+                del self.buckets[time]
+                heapq.heappop(self.times)
+        self.size -= 1
+        return event
+
+    def peek(self) -> Event:
+        if not self.size:
+            raise IndexError("peek from empty queue")
+        ranks, levels = self.buckets[self.times[0]]
+        return levels[-ranks[0]][0]
+
+
+def _source_name(source: Callable) -> str:
+    if ismethod(source) and isinstance(source.__self__, Process):
+        return f"{source.__self__.name}.{source.__name__}"
+    return source.__qualname__
+
+
+@dataclass(slots=True)
+class Timing:
+    """Call count and cumulative wall time in seconds of a profiled phase."""
+    count: int = 0
+    time: float = 0.0
+
+
+class Profiler:
+    """
+    Records where a system spends wall time.
+
+    Assign a profiler to system.profiler to start profiling and reset 
+    system.profiler to None to stop. Costs are recorded per event source 
+    (e.g., layer.forward) in three phases:
+
+        construct   Building events. Measured as the time elapsed in a call 
+                    to resolve() since it started or since the previous event 
+                    was scheduled. Events scheduled outside of resolve() are 
+                    not recorded.
+        apply       Applying event updates. Counts individual updates.
+        resolve     Notifying processes of an event (i.e., resolve fan-out). 
+                    Includes construction of any events scheduled in response.
+
+    Calls to Process.resolve() are also recorded per process. Concurrent 
+    resolution via the system executor is disabled while profiling.
+    """
+
+    sources: dict[Callable, dict[str, Timing]]
+    procs: dict["Process", Timing]
+    timer: Callable[[], float]
+    _mark: float | None
+
+    def __init__(self, timer: Callable[[], float] = perf_counter) -> None:
+        self.sources = {}
+        self.procs = {}
+        self.timer = timer
+        self._mark = None
+
+    def reset(self) -> None:
+        self.sources.clear()
+        self.procs.clear()
+
+    def _add(self, source: Callable, phase: str, dt: float) -> None:
+        try:
+            timing = self.sources[source][phase]
+        except KeyError:
+            timing = self.sources.setdefault(source, {}).setdefault(phase, 
+                Timing())
+        timing.count += 1
+        timing.time += dt
+
+    def schedule(self, event: Event) -> None:
+        if self._mark is not None:
+            now = self.timer()
+            self._add(event.source, "construct", now - self._mark)
+            self._mark = now
+
+    def apply(self, event: Event, update: Update) -> None:
+        t0 = self.timer()
+        try:
+            update.apply()
+        finally:
+            self._add(event.source, "apply", self.timer() - t0)
+
+    def resolve(self, event: Event, procs: list["Process"]) -> None:
+        timer = self.timer
+        start = timer()
+        try:
+            for proc in procs:
+                t0 = self._mark = timer()
+                proc.resolve(event)
+                timing = self.procs.get(proc) \
+                    or self.procs.setdefault(proc, Timing())
+                timing.count += 1
+                timing.time += timer() - t0
+        finally:
+            self._mark = None
+        self._add(event.source, "resolve", timer() - start)
+
+    def records(self) -> list[tuple[str, str, int, float]]:
+        """
+        Return (name, phase, count, time) records, slowest first.
+        
+        Event sources are named as 'process.method', per-process records of 
+        resolve() calls are named after the process with phase 'process'.
+        """
+        records = [(_source_name(source), phase, t.count, t.time) 
+            for source, phases in self.sources.items() 
+            for phase, t in phases.items()]
+        records.extend((proc.name, "process", t.count, t.time) 
+            for proc, t in self.procs.items())
+        records.sort(key=lambda r: r[3], reverse=True)
+        return records
+
+    def report(self, limit: int | None = None) -> str:
+        """Return a table of the slowest records, up to limit rows."""
+        records = self.records()[:limit]
+        width = max((len(r[0]) for r in records), default=4)
+        rows = [f"{'name':<{width}} {'phase':<9} {'count':>8} "
+            f"{'time':>10} {'mean':>10}"]
+        for name, phase, n, t in records:
+            rows.append(f"{name:<{width}} {phase:<9} {n:>8d} "
+                f"{t:>10.6f} {t / n:>10.3e}")
+        return "\n".join(rows)
+
+    def dump(self, file: str | PathLike) -> None:
+        """Write records to a CSV file."""
+        with open(file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "phase", "count", "time"])
+            writer.writerows(self.records())
+
+
+def _resolve_all(proc: "Process", events: list[Event]) -> list[list[Event]]:
+    """Resolve events in order, capturing events scheduled by proc."""
+    scheduled = []
+    for event in events:
+        buffer = []
+        token = SCHEDULED.set(buffer)
+        try:
+            proc.resolve(event)
+        finally:
+            SCHEDULED.reset(token)
+        scheduled.append(buffer)
+    return scheduled
 
 
 class Process[R: KSRoot]:
@@ -141,6 +511,10 @@ class Process[R: KSRoot]:
     Process instances may be used in with statements for compositional model 
     construction. 
 
+    Set parallel to True in subclasses whose resolve() method only reads 
+    simulation state and schedules events. Such processes may be resolved 
+    concurrently when the system has an executor.
+
     >>> with Process("p1") as p1:
     ...     p2 = Process("p2")
     ...     assert p1.system is p2.system
@@ -153,13 +527,139 @@ class Process[R: KSRoot]:
         A simulated system.
 
         Maintains global simulation data.
+
+        Events are routed to the resolve() method of processes. Processes that 
+        subscribe to event sources or update targets only receive matching 
+        events, processes that override resolve() without subscribing receive 
+        every event, and processes that do not override resolve() receive none. 
+        Processes are always notified in order of registration.
+
+        The number of queued events from each source is tracked in pending.
+
+        If coalesce is True, all events sharing the next time and priority are 
+        processed as a batch. Consecutive updates of the same type and target 
+        in a batch are merged via Update.coalesce() before being applied. Routes 
+        matching merged updates are resolved once per batch, with a synthetic 
+        event carrying the updates to their target as applied, right after the 
+        first event in the batch to update the target; other routes and 
+        unsubscribed processes are resolved with each event in the batch.
+
+        If an executor (e.g., a ThreadPoolExecutor) is given, consecutive 
+        events sharing the next time and priority are processed as a batch as 
+        long as their update targets are pairwise disjoint and no event updates 
+        a target referenced by an attribute (e.g., a site) of a process 
+        resolving an earlier event in the batch. Calls to the resolve() 
+        methods of parallel processes are then submitted to the executor, one 
+        task per process. Events scheduled during resolution are queued in the 
+        same order as in sequential processing. Processes must not read sites 
+        other than those they reference as attributes during resolution. Tasks 
+        run in a copy of the calling context (e.g., active gradient tapes 
+        and profilers carry over). Only thread-based executors are supported, 
+        as resolution mutates process state (e.g., gradient tapes) that would 
+        be lost in another process; a ProcessPoolExecutor is rejected.
+
+        The event queue defaults to a HeapQueue. To use another scheduler, such 
+        as a BucketQueue, assign it to system.queue before scheduling events.
+
+        To measure processing costs, assign a Profiler to system.profiler.
+
+        Each processed event is passed to the write() method of every sink in 
+        sinks after its updates are applied and before processes resolve it. 
+        In batches, all updates in the batch are applied first.
         """
 
         root: R_
         clock: Clock = field(default_factory=Clock)
-        queue: list[Event] = field(default_factory=list)
+        queue: EventQueue = field(default_factory=HeapQueue)
         procs: list["Process"] = field(default_factory=list)
         logger: logging.Logger = logging.getLogger(__name__)
+        ranks: dict["Process", int] = field(default_factory=dict)
+        listeners: dict["Process", None] = field(default_factory=dict)
+        routes: dict[Hashable, dict["Process", int]] = \
+            field(default_factory=dict)
+        pending: dict[Callable, int] = field(default_factory=dict)
+        coalesce: bool = False
+        executor: Executor | None = None
+        profiler: Profiler | None = None
+        sinks: list[EventSink] = field(default_factory=list)
+
+        def register(self, proc: "Process") -> None:
+            """Add a process to the system."""
+            self.ranks[proc] = len(self.procs)
+            self.procs.append(proc)
+            if type(proc).resolve is not Process.resolve:
+                self.listeners[proc] = None
+
+        def subscribe(self, proc: "Process", *keys: Hashable) -> None:
+            """
+            Route events matching any of keys to proc.
+
+            Keys may be event sources or (update type, update target) pairs. 
+            Once subscribed, proc no longer receives unmatched events, even if 
+            no keys are given.
+            """
+            self.listeners.pop(proc, None)
+            for key in keys:
+                procs = self.routes.setdefault(key, {})
+                procs[proc] = procs.get(proc, 0) + 1
+
+        def unsubscribe(self, proc: "Process", *keys: Hashable) -> None:
+            """Stop routing events matching any of keys to proc."""
+            for key in keys:
+                procs = self.routes.get(key, {})
+                if proc not in procs:
+                    continue
+                procs[proc] -= 1
+                if procs[proc] <= 0:
+                    del procs[proc]
+                if not procs:
+                    del self.routes[key]
+
+        def dispatch(
+            self, event: Event, merged: dict | None = None
+        ) -> list["Process"]:
+            """
+            Return processes to be notified of event in order.
+            
+            If merged is given, routes for (update type, target) keys in merged 
+            are followed only if they map to event.
+            """
+            found = set(self.listeners)
+            if (procs := self.routes.get(event.source)) is not None:
+                found.update(procs)
+            return self._route(event, found, merged)
+
+        def _route(self, 
+            event: Event, found: set["Process"], merged: dict | None = None
+        ) -> list["Process"]:
+            routes = self.routes
+            for ud in event.updates:
+                key = (type(ud), ud.target)
+                if merged and merged.get(key, event) is not event:
+                    continue
+                if (procs := routes.get(key)) is not None:
+                    found.update(procs)
+            return sorted(found, key=self.ranks.__getitem__)
+
+        def fork(self, memo: dict[int, Any] | None = None) -> Self:
+            """
+            Return an independent copy of the system.
+
+            Processes, keyspaces, queued events and clock state are deep 
+            copied, but numdict data is shared between the two systems until 
+            either one first mutates it in place. Forking cost therefore scales 
+            with the number of numdicts rather than with their size. The logger 
+            and executor are shared, and the fork starts without sinks.
+
+            To retrieve copies of objects held outside the system (e.g., 
+            process handles), pass an empty dict as memo and look them up with 
+            memo[id(obj)] afterwards. See also Process.fork().
+            """
+            memo = {} if memo is None else memo
+            memo[id(self.logger)] = self.logger
+            memo[id(self.executor)] = self.executor
+            memo[id(self.sinks)] = []
+            return deepcopy(self, memo)
 
         def check_root(self, *keyspaces: KSPath) -> None:
             for keyspace in keyspaces:
@@ -171,32 +671,212 @@ class Process[R: KSRoot]:
             return Index(self.root, form)
 
         def schedule(self, event: Event) -> None:
+            if self.executor is not None \
+                and (buffer := SCHEDULED.get(None)) is not None:
+                buffer.append(event)
+                return
             if event.scheduled:
                 raise ValueError("Cannot reschedule previously scheduled event")
-            if event.time < timedelta():
+            dt = event._dt
+            if dt < timedelta():
                 raise ValueError("Cannot schedule an event in the past.")
-            event.time += self.clock.time
-            event.number = next(self.clock.counter)
+            clock = self.clock
+            event.tick = clock.tick + dt // clock.res if dt else clock.tick
+            event.res = clock.res
+            event.number = next(clock.counter)
             event.scheduled = True
-            heapq.heappush(self.queue, event)
+            if self.profiler is not None:
+                self.profiler.schedule(event)
+            self.queue.push(event)
+            pending = self.pending
+            pending[event.source] = pending.get(event.source, 0) + 1
 
         def advance(self) -> Event:
-            """Process the next event in the queue."""
-            event = heapq.heappop(self.queue)
-            self.clock.advance(event.time)
-            for update in event.updates:
+            """
+            Process the next event in the queue.
+            
+            If events are processed in batches, processes the next batch of 
+            events and returns the last event in the batch.
+            """
+            if isinstance(self.executor, ProcessPoolExecutor):
+                raise TypeError("System executor must run tasks in threads of "
+                    "the current process")
+            event = self._pop()
+            self.clock.advance(event.tick)
+            queue = self.queue
+            merged = None
+            if self.coalesce and queue and self._same_batch(event):
+                batch = [event]
+                while queue and self._same_batch(event):
+                    batch.append(self._pop())
+                updates, merged = self._coalesce(batch)
+            elif self.executor is not None and self.profiler is None and queue \
+                and self._same_batch(event):
+                batch = self._independent(event)
+                updates = [(ev, ud) for ev in batch for ud in ev.updates]
+            else:
+                self._apply((event, ud) for ud in event.updates)
+                self._log(event)
+                self._notify(event, self.dispatch(event))
+                return event
+            self._apply(updates)
+            for event in batch:
+                self._log(event)
+            calls = self._calls(batch, merged)
+            if self.executor is None or self.profiler is not None:
+                for event, procs in calls:
+                    self._notify(event, procs)
+            else:
+                self._resolve(calls)
+            return batch[-1]
+
+        def _pop(self) -> Event:
+            event = self.queue.pop()
+            pending = self.pending
+            if (n := pending[event.source] - 1):
+                pending[event.source] = n
+            else:
+                del pending[event.source]
+            return event
+
+        def _same_batch(self, event: Event) -> bool:
+            head = self.queue.peek()
+            return head.tick == event.tick and head.priority == event.priority
+
+        def _independent(self, event: Event) -> list[Event]:
+            """
+            Pop events that can be resolved in a batch with event.
+
+            Targets and reads are tracked by id. A process is taken to read 
+            any object it references as an attribute.
+            """
+            batch = [event]
+            targets = {id(ud.target) for ud in event.updates}
+            reads = self._reads(event)
+            while self.queue and self._same_batch(event):
+                head = self.queue.peek()
+                new = {id(ud.target) for ud in head.updates}
+                if not (targets.isdisjoint(new) and reads.isdisjoint(new)):
+                    break
+                targets.update(new)
+                reads.update(self._reads(head))
+                batch.append(self._pop())
+            return batch
+
+        def _reads(self, event: Event) -> set[int]:
+            return {id(v) for proc in self.dispatch(event) 
+                for v in vars(proc).values()}
+
+        def _calls(self, 
+            batch: list[Event], merged: dict[Hashable, Event] | None
+        ) -> list[tuple[Event, list["Process"]]]:
+            """Pair events in batch and synthetic events with their procs."""
+            synthetic = {ev.number: ev for ev in merged.values()} \
+                if merged else {}
+            calls = []
+            for event in batch:
+                calls.append((event, self.dispatch(event, merged)))
+                if (ev := synthetic.get(event.number)) is not None:
+                    calls.append((ev, self._route(ev, set(), merged)))
+            return calls
+
+        def _notify(self, event: Event, procs: list["Process"]) -> None:
+            if self.profiler is None:
+                for proc in procs:
+                    proc.resolve(event)
+            else:
+                self.profiler.resolve(event, procs)
+
+        def _resolve(self, calls: list[tuple[Event, list["Process"]]]) -> None:
+            assert self.executor is not None
+            tasks: dict[Process, list[Event]] = {}
+            for event, procs in calls:
+                for proc in procs:
+                    if proc.parallel:
+                        tasks.setdefault(proc, []).append(event)
+            futures = {proc: self.executor.submit(
+                    copy_context().run, _resolve_all, proc, events) 
+                for proc, events in tasks.items()}
+            results: dict[Process, Iterator[list[Event]]] = {}
+            scheduled: list[list[Event]] = []
+            for event, procs in calls:
+                for proc in procs:
+                    if proc.parallel:
+                        scheduled.append([])
+                    else:
+                        scheduled.extend(_resolve_all(proc, [event]))
+            for proc, future in futures.items():
+                results[proc] = iter(future.result())
+            i = 0
+            for event, procs in calls:
+                for proc in procs:
+                    if proc.parallel:
+                        scheduled[i] = next(results[proc])
+                    i += 1
+            for events in scheduled:
+                for event in events:
+                    self.schedule(event)
+
+        def _coalesce(
+            self, batch: list[Event]
+        ) -> tuple[list[tuple[Event, Update]], dict[Hashable, Event]]:
+            updates: list[tuple[Event, Update]] = []
+            first: dict[Hashable, Event] = {}
+            latest: dict[Hashable, int] = {}
+            keys: set[Hashable] = set()
+            for event in batch:
+                for ud in event.updates:
+                    key = (type(ud), ud.target)
+                    first.setdefault(key, event)
+                    if key in latest:
+                        i = latest[key]
+                        new = updates[i][1].coalesce(ud)
+                        if new is not None:
+                            updates[i] = (event, new)
+                            keys.add(key)
+                            continue
+                    if type(ud).coalesce is Update.coalesce:
+                        latest.clear()
+                    else:
+                        latest[key] = len(updates)
+                    updates.append((event, ud))
+            # Resolvers routed by merged keys see updates as applied, carried by 
+            # a synthetic event standing in for the first event to update each 
+            # merged target.
+            merged: dict[Hashable, Event] = {}
+            synthetic: dict[Event, Event] = {}
+            for _, ud in updates:
+                if (key := (type(ud), ud.target)) not in keys:
+                    continue
+                event = first[key]
+                if (ev := synthetic.get(event)) is None:
+                    ev = synthetic[event] = Event(event.source, [], 
+                        priority=event.priority, number=event.number, 
+                        scheduled=True)
+                    ev.tick, ev.res = event.tick, event.res
+                ev.append(ud)
+                merged[key] = ev
+            return updates, merged
+
+        def _apply(self, updates: Iterable[tuple[Event, Update]]) -> None:
+            profiler = self.profiler
+            for event, update in updates:
                 try:
-                    update.apply()
+                    if profiler is None:
+                        update.apply()
+                    else:
+                        profiler.apply(event, update)
                 except Exception as e:
                     raise RuntimeError(
                         f"Update scheduled by {event.source.__qualname__} at "
                         f"{event.time} failed") from e
+
+        def _log(self, event: Event) -> None:
+            for sink in self.sinks:
+                sink.write(event)
             if self.logger.isEnabledFor(logging.INFO):
                 msg = event.describe()
                 self.logger.info(msg)
-            for proc in self.procs:
-                proc.resolve(event)
-            return event
         
         def run_all(self) -> None:
             """
@@ -209,8 +889,22 @@ class Process[R: KSRoot]:
             while self.queue and self.clock.has_time:
                 self.advance()
 
+        def run_until(self, timepoint: timedelta) -> None:
+            """
+            Process all events up to timepoint, then advance clock to it.
+            
+            Raises StopIteration if timepoint is beyond the clock time limit.
+            """
+            tick = self.clock.ticks(timepoint)
+            while self.queue and self.queue.peek().tick <= tick \
+                and self.clock.has_time:
+                self.advance()
+            if self.clock.tick < tick:
+                self.clock.advance(tick)
+
     name: str
     system: System
+    parallel: ClassVar[bool] = False
     __tokens: list[Token]
 
     def __init__(self, name: str, root: R | None = None) -> None:
@@ -229,7 +923,7 @@ class Process[R: KSRoot]:
             self.name = name
             self.system = sup.system
         self.__tokens = []
-        self.system.procs.append(self)
+        self.system.register(self)
 
     def __repr__(self) -> str:
         return f"<{type(self).__qualname__} '{self.name}' at {hex(id(self))}>"        
@@ -249,6 +943,25 @@ class Process[R: KSRoot]:
         """
         pass
 
+    def fork(self) -> Self:
+        """Return the copy of self in a fork of its system."""
+        memo = {}
+        self.system.fork(memo)
+        return memo[id(self)]
+
+    def subscribe(self, *keys: Hashable) -> None:
+        """
+        Receive only events matching any subscribed key.
+        
+        Keys may be event sources or (update type, update target) pairs. See 
+        Process.System for details.
+        """
+        self.system.subscribe(self, *keys)
+
+    def unsubscribe(self, *keys: Hashable) -> None:
+        """Stop receiving events matching any of keys."""
+        self.system.unsubscribe(self, *keys)
+
     def breakpoint(self, dt: timedelta, priority: int = 0) \
         -> Event:
         """Schedule a dummy event at specified time."""
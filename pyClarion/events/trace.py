@@ -0,0 +1,427 @@
+from typing import Any, BinaryIO, Iterator, NamedTuple
+from datetime import timedelta
+from array import array
+from os import PathLike
+import json
+import struct
+
+from .system import Process, Event, _source_name
+from .sites import State
+from .updates import StateUpdate
+from .snapshot import _sites
+from ..numdicts import Key, NumDict, Undefined
+from ..numdicts.keyspaces import KSPath
+
+
+MAGIC = b"PYCLTRC1"
+HEADER = struct.Struct("=8sQ")
+BLOCK = struct.Struct("=4sQQQQ")
+RECORD_MAGIC = b"PYCLREC1"
+RECORD_BLOCK = struct.Struct("=4sQQQ")
+EVENT_COLUMNS = ("tick", "priority", "number", "source", "size")
+UPDATE_COLUMNS = ("type", "target", "size")
+
+
+class TraceRecord(NamedTuple):
+    """A traced event."""
+    time: timedelta
+    priority: int
+    number: int
+    source: str
+    updates: list[tuple[str, str, dict[Key, float] | None]]
+    """Update type, target and data (None if not recorded) for each update."""
+
+
+def _dense(d: NumDict, cols: dict[Key, int], width: int) -> list[float]:
+    """Return values of d in column order; Undefined values become NaN."""
+    c = d._c
+    row = [float("nan") if c is Undefined else c] * width
+    for k, v in d._d.items():
+        row[cols[k]] = v
+    return row
+
+
+class SiteRecord(NamedTuple):
+    """Recorded values of a site, stored as a time × key table."""
+    keys: list[Key]
+    times: list[timedelta]
+    values: array
+    """Row-major float64 values, one row per time; NaN marks missing keys."""
+
+    def row(self, i: int) -> dict[Key, float]:
+        """Return the values recorded at times[i]."""
+        w = len(self.keys)
+        return dict(zip(self.keys, self.values[i * w:(i + 1) * w]))
+
+    def column(self, key: Key) -> array:
+        """Return the values of key over time."""
+        w = len(self.keys)
+        return self.values[self.keys.index(key)::w]
+
+
+class _SiteBuffer:
+    """Preallocated time × key buffer for a single site."""
+
+    def __init__(self, name: str, state: State, rows: int) -> None:
+        self.name = name
+        self.state = state
+        self.rows = rows
+        self.keys: list[Key] = list(state.index)
+        self.cols = {k: j for j, k in enumerate(self.keys)}
+        self.ticks = array("q", bytes(8 * rows))
+        self.values = array("d", bytes(8 * rows * len(self.keys)))
+        self.n = 0
+        self.seen = 0
+
+    def _widen(self, keys: list[Key]) -> None:
+        w, rows = len(self.keys), self.rows
+        self.keys.extend(keys)
+        self.cols.update((k, j) for j, k in enumerate(self.keys) if j >= w)
+        pad = array("d", [float("nan")] * len(keys))
+        values = array("d")
+        for i in range(rows):
+            values.extend(self.values[i * w:(i + 1) * w])
+            values.extend(pad)
+        self.values = values
+
+    def capture(self, tick: int) -> None:
+        d = self.state.data[0]
+        new = [k for k in d._d if k not in self.cols]
+        if new:
+            self._widen(new)
+        row = _dense(d, self.cols, len(self.keys))
+        i = self.n % self.rows
+        w = len(row)
+        self.ticks[i] = tick
+        self.values[i * w:(i + 1) * w] = array("d", row)
+        self.n += 1
+
+    def order(self) -> list[int]:
+        """Return buffered row positions in chronological order."""
+        if self.n <= self.rows:
+            return list(range(self.n))
+        i = self.n % self.rows
+        return list(range(i, self.rows)) + list(range(i))
+
+    def record(self, res: timedelta) -> SiteRecord:
+        w = len(self.keys)
+        values = array("d")
+        times = []
+        for i in self.order():
+            times.append(self.ticks[i] * res)
+            values.extend(self.values[i * w:(i + 1) * w])
+        return SiteRecord(list(self.keys), times, values)
+
+
+class SiteRecorder:
+    """
+    Records the values of chosen sites as they are updated.
+
+    After each processed event that updates a recorded state, the current 
+    value of the state (i.e., state[0]) is captured as a row of a 
+    preallocated time × key table. Columns are the members of the state index 
+    at the time of attachment; keys later appearing in recorded data are 
+    appended as new columns, with earlier rows set to NaN. Undefined values 
+    are also recorded as NaN. In batches, rows are captured after all updates 
+    in the batch are applied.
+
+    Each site keeps a buffer of rows entries. If every is greater than 1, 
+    only every n-th update of each site is recorded. Without a file, buffers 
+    act as ring buffers retaining the most recent rows entries. With a file, 
+    full buffers are written out as blocks and reused, so that the complete 
+    history is kept on disk at bounded memory cost. States are named by the 
+    owning process and site (e.g., 'choice.main').
+
+    Use as a context manager, or call attach() and close() explicitly. Access 
+    buffered values with record() and read files back with read_sites().
+    """
+
+    system: Process.System
+    file: BinaryIO | None
+    every: int
+
+    def __init__(self,
+        system: Process.System,
+        *states: State,
+        rows: int = 1024,
+        every: int = 1,
+        file: str | PathLike | None = None
+    ) -> None:
+        if rows < 1 or every < 1:
+            raise ValueError("rows and every must be positive")
+        names: dict[State, str] = {}
+        for proc in system.procs:
+            for name, state in _sites(proc):
+                names.setdefault(state, f"{proc.name}.{name}")
+        self.system = system
+        self.every = every
+        self.buffers = {s: _SiteBuffer(names.get(s, repr(s)), s, rows) 
+            for s in states}
+        self.file = None
+        if file is not None:
+            self.file = open(file, "wb")
+            self.file.write(HEADER.pack(RECORD_MAGIC, system.clock.res // 
+                timedelta(microseconds=1)))
+
+    def __enter__(self) -> "SiteRecorder":
+        self.attach()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def attach(self) -> None:
+        """Start recording sites updated by events processed by system."""
+        self.system.sinks.append(self)
+
+    def close(self) -> None:
+        """Stop recording; flush buffered rows and close the file, if any."""
+        if self in self.system.sinks:
+            self.system.sinks.remove(self)
+        if self.file is not None and not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def write(self, event: Event) -> None:
+        """Capture states targeted by updates in event."""
+        buffers, done = self.buffers, set()
+        for ud in event.updates:
+            buf = buffers.get(ud.target)
+            if buf is None or buf in done:
+                continue
+            done.add(buf)
+            buf.seen += 1
+            if (buf.seen - 1) % self.every:
+                continue
+            buf.capture(event.tick)
+            if self.file is not None and buf.rows <= buf.n:
+                self._flush(buf)
+
+    def record(self, state: State) -> SiteRecord:
+        """
+        Return buffered values of state in chronological order.
+        
+        If recording to a file, only rows not yet flushed are returned.
+        """
+        return self.buffers[state].record(self.system.clock.res)
+
+    def flush(self) -> None:
+        """Write all buffered rows to file as blocks."""
+        for buf in self.buffers.values():
+            self._flush(buf)
+
+    def _flush(self, buf: _SiteBuffer) -> None:
+        assert self.file is not None
+        n, w = min(buf.n, buf.rows), len(buf.keys)
+        if not n:
+            return
+        strings = json.dumps([buf.name, *map(str, buf.keys)], 
+            separators=(",", ":")).encode()
+        strings += b" " * (-len(strings) % 8)
+        f = self.file
+        f.write(RECORD_BLOCK.pack(b"REC1", n, w, len(strings)))
+        f.write(strings)
+        order = buf.order()
+        f.write(array("q", (buf.ticks[i] for i in order)))
+        for i in order:
+            f.write(buf.values[i * w:(i + 1) * w])
+        buf.n = 0
+
+
+class TraceWriter:
+    """
+    A streaming, append-only binary trace of processed events.
+
+    Records the time, priority, number and source of each event processed by
+    system, along with the type and target of each of its updates. If payloads
+    is True, the data of state updates is also recorded.
+
+    Events are buffered in columnar form and written out in blocks of up to
+    chunk events. Each block consists of a header, any strings (sources,
+    update types, targets and payload keys) not seen in earlier blocks, and
+    contiguous int64 and float64 columns. State targets are named by the
+    owning process and site (e.g., 'layer.main'). Payload sizes are -1 for 
+    updates whose data was not recorded.
+
+    Use as a context manager, or call attach() and close() explicitly. Read
+    traces back with read_trace().
+    """
+
+    system: Process.System
+    file: BinaryIO
+    payloads: bool
+    chunk: int
+
+    def __init__(self,
+        system: Process.System,
+        file: str | PathLike,
+        payloads: bool = False,
+        chunk: int = 4096
+    ) -> None:
+        self.system = system
+        self.file = open(file, "wb")
+        self.payloads = payloads
+        self.chunk = chunk
+        self.file.write(HEADER.pack(MAGIC, system.clock.res //
+            timedelta(microseconds=1)))
+        self._strings: dict[str, int] = {}
+        self._new: list[str] = []
+        self._names: dict[Any, int] = {}
+        self._clear()
+
+    def __enter__(self) -> "TraceWriter":
+        self.attach()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _clear(self) -> None:
+        self._events = {name: array("q") for name in EVENT_COLUMNS}
+        self._updates = {name: array("q") for name in UPDATE_COLUMNS}
+        self._keys = array("q")
+        self._vals = array("d")
+        self._n = 0
+
+    def attach(self) -> None:
+        """Start recording events processed by system."""
+        self.system.sinks.append(self)
+
+    def close(self) -> None:
+        """Stop recording, flush buffered events and close the file."""
+        if self in self.system.sinks:
+            self.system.sinks.remove(self)
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def _intern(self, s: str) -> int:
+        try:
+            return self._strings[s]
+        except KeyError:
+            i = self._strings[s] = len(self._strings)
+            self._new.append(s)
+            return i
+
+    def _name(self, obj: Any) -> int:
+        try:
+            return self._names[obj]
+        except KeyError:
+            pass
+        if isinstance(obj, State):
+            for proc in self.system.procs:
+                for name, state in _sites(proc):
+                    self._names.setdefault(state,
+                        self._intern(f"{proc.name}.{name}"))
+        if obj not in self._names:
+            s = str(~obj) if isinstance(obj, KSPath) \
+                else _source_name(obj) if callable(obj) else repr(obj)
+            self._names[obj] = self._intern(s)
+        return self._names[obj]
+
+    def write(self, event: Event) -> None:
+        """Append event to the trace."""
+        events, updates = self._events, self._updates
+        events["tick"].append(event.tick)
+        events["priority"].append(event.priority)
+        events["number"].append(event.number)
+        events["source"].append(self._name(event.source))
+        events["size"].append(len(event.updates))
+        for ud in event.updates:
+            n = -1
+            if self.payloads and isinstance(ud, StateUpdate):
+                data = ud.data
+                assert isinstance(data, dict)
+                n = len(data)
+                self._keys.extend(self._intern(str(k)) for k in data)
+                self._vals.extend(data.values())
+            updates["type"].append(self._intern(type(ud).__qualname__))
+            updates["target"].append(self._name(ud.target))
+            updates["size"].append(n)
+        self._n += 1
+        if self.chunk <= self._n:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered events to file as a block."""
+        if not self._n:
+            return
+        strings = json.dumps(self._new, separators=(",", ":")).encode()
+        strings += b" " * (-len(strings) % 8)
+        f = self.file
+        f.write(BLOCK.pack(b"BLK1", self._n, len(self._updates["type"]),
+            len(self._vals), len(strings)))
+        f.write(strings)
+        for column in self._events.values():
+            f.write(column)
+        for column in self._updates.values():
+            f.write(column)
+        f.write(self._keys)
+        f.write(self._vals)
+        self._new.clear()
+        self._clear()
+
+
+def read_trace(file: str | PathLike) -> Iterator[TraceRecord]:
+    """Yield events recorded in a trace file in order."""
+    with open(file, "rb") as f:
+        magic, res = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("Not a pyClarion trace")
+        res = timedelta(microseconds=res)
+        strings: list[str] = []
+        while (head := f.read(BLOCK.size)):
+            _, n, u, p, m = BLOCK.unpack(head)
+            strings.extend(json.loads(f.read(m)))
+            events = [_column(f, "q", n) for _ in EVENT_COLUMNS]
+            kinds, targets, sizes = [_column(f, "q", u)
+                for _ in UPDATE_COLUMNS]
+            keys, vals = _column(f, "q", p), _column(f, "d", p)
+            j = k = 0
+            for tick, priority, number, source, size in zip(*events):
+                uds = []
+                for i in range(j, j + size):
+                    data = None
+                    if 0 <= (l := sizes[i]):
+                        data = {Key(strings[key]): val
+                            for key, val in zip(keys[k:k + l], vals[k:k + l])}
+                        k += l
+                    uds.append((strings[kinds[i]], strings[targets[i]], data))
+                j += size
+                yield TraceRecord(tick * res, priority, number,
+                    strings[source], uds)
+
+
+def _column(f: BinaryIO, typecode: str, n: int) -> array:
+    column = array(typecode)
+    column.fromfile(f, n)
+    return column
+
+
+def read_sites(file: str | PathLike) -> dict[str, SiteRecord]:
+    """Return site values recorded in a file by a SiteRecorder."""
+    with open(file, "rb") as f:
+        magic, res = HEADER.unpack(f.read(HEADER.size))
+        if magic != RECORD_MAGIC:
+            raise ValueError("Not a pyClarion site record")
+        res = timedelta(microseconds=res)
+        blocks: dict[str, list[tuple[list[str], array, array]]] = {}
+        while (head := f.read(RECORD_BLOCK.size)):
+            _, n, w, m = RECORD_BLOCK.unpack(head)
+            name, *keys = json.loads(f.read(m))
+            blocks.setdefault(name, []).append(
+                (keys, _column(f, "q", n), _column(f, "d", n * w)))
+    records = {}
+    for name, chunks in blocks.items():
+        keys = chunks[-1][0]
+        w, nan = len(keys), float("nan")
+        times, values = [], array("d")
+        for ks, ticks, vals in chunks:
+            v = len(ks)
+            pad = [nan] * (w - v)
+            for i, tick in enumerate(ticks):
+                times.append(tick * res)
+                values.extend(vals[i * v:(i + 1) * v])
+                values.extend(pad)
+        records[name] = SiteRecord(list(map(Key, keys)), times, values)
+    return records
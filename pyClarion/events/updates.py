@@ -6,14 +6,27 @@ from math import isnan
 from .system import Update
 from .sites import State
 from ..numdicts import Key, NumDict
+from ..numdicts.numdicts import inplace
 from ..numdicts.keyspaces import KSParent, KSChild
 
 
 @dataclass(slots=True)
 class StateUpdate(Update[State]):
+    """
+    An update to a channel of a state.
+
+    Data is trusted if it is given as a numdict over the state index, or if 
+    trusted is set by the caller. Trusted data must map member keys of the 
+    state index to floats. Writes of trusted data, and adds of trusted data 
+    to channels with default 0.0, are applied in place to the current 
+    channel value without further validation. Writes and in-place adds 
+    replace a shared or aliased current value by a fresh copy instead of 
+    mutating it. In-place adds drop entries that sum to exactly 0.0.
+    """
     state: "State"
     data: NumDict | dict[Key, float]
     method: Literal["push", "add", "write"] = "push"
+    trusted: bool = False
 
     def __post_init__(self) -> None:
         data = self.data
@@ -25,21 +38,29 @@ class StateUpdate(Update[State]):
                 f"match site {state.const}")
         if isinstance(data, NumDict):
             self.data = data.d
+            self.trusted = True
 
     def apply(self) -> None:
         data = self.data
         assert isinstance(data, dict)
         channel = self._get_channel()
-        if self.method == "write":
-            with channel[0].mutable():
-                channel[0].update(data)
-            return
-        data = self.state.new(data)
         match self.method:
             case "push":
-                channel.appendleft(data)
+                self.state.push(channel, data)
+            case "write" if self.trusted:
+                d = _owned(channel)
+                with d.mutable():
+                    _write(d, data)
+            case "write":
+                d = _owned(channel)
+                with d.mutable():
+                    d.update(data)
+            case "add" if self.trusted and channel[0]._c == 0.0:
+                d = _owned(channel)
+                with d.mutable():
+                    _accumulate(d, data)
             case "add":
-                channel[0] = channel[0].sum(data)
+                channel[0] = channel[0].sum(self.state.new(data))
             case _:
                 assert False
 
@@ -50,6 +71,31 @@ class StateUpdate(Update[State]):
     def target(self) -> "State":
         return self.state
 
+    def coalesce(self, other: Update) -> "StateUpdate | None":
+        """
+        Merge with a subsequent update to the same channel, if possible.
+        
+        A later push overrides any earlier update. Writes are merged into 
+        earlier pushes and writes. Adds are merged into earlier pushes and adds 
+        if the site default is 0.0.
+        """
+        assert isinstance(other, StateUpdate)
+        d1, d2 = self.data, other.data
+        assert isinstance(d1, dict) and isinstance(d2, dict)
+        trusted = self.trusted and other.trusted
+        match self.method, other.method:
+            case _, "push":
+                return other
+            case ("push" | "write") as method, "write":
+                return type(self)(self.state, {**d1, **d2}, method, trusted)
+            case ("push" | "add") as method, "add" if self.state.const == 0.0:
+                data = dict(d1)
+                for k, v in d2.items():
+                    data[k] = data.get(k, 0.0) + v
+                return type(self)(self.state, data, method, trusted)
+            case _:
+                return None
+
 
 class ForwardUpdate(StateUpdate):
     __slots__ = ()
@@ -60,11 +106,61 @@ class ForwardUpdate(StateUpdate):
 
 
 class BackwardUpdate(StateUpdate):
+    """
+    An update to the gradient channel of a state.
+    
+    With method "add", gradients are accumulated in place into the current 
+    gradient buffer instead of allocating a new NumDict, as for trusted adds. 
+    Untrusted gradient keys are validated first.
+    """
     __slots__ = ()
     def __post_init__(self) -> None:
         super().__post_init__()
     def _get_channel(self) -> deque[NumDict]:
         return self.state.grad
+    def apply(self) -> None:
+        buffer = self.state.grad[0]
+        if self.method != "add" or self.trusted or buffer._c != 0.0:
+            return super().apply()
+        data = self.data
+        assert isinstance(data, dict)
+        for k in data:
+            if k not in buffer:
+                raise ValueError(f"Key '{k}' not a member")
+        buffer = _owned(self.state.grad)
+        with buffer.mutable():
+            _accumulate(buffer, data)
+
+
+def _owned(channel: deque[NumDict]) -> NumDict:
+    """
+    Return the current value of channel for in-place mutation.
+    
+    Shared or aliased values are replaced in channel by a fresh copy, so that 
+    other holders of the current value (e.g., gradient tapes) do not observe 
+    the mutation.
+    """
+    d = channel[0]
+    if d._s or d._a:
+        d = channel[0] = type(d)(d._i, d._d.copy(), d._c, False)
+    return d
+
+
+@inplace
+def _write(d: NumDict, data: dict[Key, float]) -> None:
+    """Write trusted data to d in place."""
+    d._d.update(data)
+
+
+@inplace
+def _accumulate(d: NumDict, data: dict[Key, float]) -> None:
+    """Add data to d in place, assuming a default of 0.0."""
+    _d = d._d
+    for k, v in data.items():
+        if (v := _d.get(k, 0.0) + v) != 0.0:
+            _d[k] = float(v)
+        else:
+            _d.pop(k, None)
 
 
 @dataclass(slots=True)
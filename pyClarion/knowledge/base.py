@@ -66,6 +66,18 @@ class Sort[C: Term](KSNode[C], Symbol):
         while True:
             yield f"{self._prefix_}_{next(self._counter_)}"
 
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        del state["_namer_"]
+        state["_counter_"] = n = next(self._counter_)
+        self._counter_ = count(n)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._counter_ = count(state["_counter_"])
+        self._namer_ = self._name_generator_()
+
 
 class Family(KSNode[Sort], Symbol):
     """
@@ -0,0 +1,129 @@
+from typing import Any
+from itertools import count
+
+from .base import Root, Sort, Term
+from .terms import Indexical, Var, MatchVar, Compound, Chunk, Rule
+from ..numdicts import ks_crawl
+
+
+def _dump_sort(sort: Sort) -> dict[str, Any]:
+    """Return the member names, name counter and member contents of sort."""
+    n = next(sort._counter_)
+    sort._counter_ = count(n)
+    terms = {name: _dump_compound(sort[name]) for name in sort 
+        if isinstance(sort[name], Compound)}
+    return {"names": list(sort), "counter": n, "terms": terms}
+
+
+def _dump_compound(term: Compound) -> dict[str, Any]:
+    """Return a json-serializable record of the contents of term."""
+    n = next(term._counter_)
+    term._counter_ = count(n)
+    template = term._template_
+    entry: dict[str, Any] = {
+        "counter": n,
+        "template": None if template is None else str(~template),
+        "valuation": [[var.name, str(~val)] for var, val in term._valuation_]}
+    if isinstance(term, Chunk):
+        entry["dyads"] = [[_dump_constituent(d), _dump_constituent(v), w] 
+            for (d, v), w in term._dyads_.items()]
+    if isinstance(term, Rule):
+        entry["chunks"] = [[str(~c), w] for c, w in term._chunks_.items()]
+    return entry
+
+
+def _dump_constituent(x: Term | Indexical | Var | MatchVar) -> Any:
+    match x:
+        case Term():
+            return str(~x)
+        case Indexical():
+            return {"this": x.name}
+        case Var():
+            return {"var": x.name, "sort": str(~x.sort)}
+        case MatchVar():
+            return {"match": str(~x.term), 
+                "vars": [_dump_constituent(v) for v in x.variables]}
+    raise TypeError(f"Unexpected constituent {x!r}")
+
+
+def _load_sorts(
+    root: Root, *items: tuple[Sort, dict[str, Any], type[Compound]]
+) -> tuple[tuple[Compound, ...], ...]:
+    """
+    Return terms for members listed in each entry missing from its sort.
+    
+    Each item is a triple (sort, entry, cls), where entry was produced by 
+    _dump_sort() and cls is the member type of sort. New terms are restored 
+    with their saved contents. References to new terms are resolved among 
+    the new terms, others are resolved against root. Advances the name 
+    counter of each sort past its saved counter.
+    """
+    new: dict[str, Compound] = {}
+    records, result = [], []
+    for sort, entry, cls in items:
+        n = next(sort._counter_)
+        sort._counter_ = count(max(n, entry["counter"]))
+        terms, names = [], set(sort)
+        for name in entry["names"]:
+            if name not in names:
+                term = new[f"{~sort}:{name}"] = cls()
+                term._name_ = name
+                terms.append(term)
+                records.append((term, entry["terms"][name]))
+        result.append(tuple(terms))
+    _load_compounds(root, new, records)
+    return tuple(result)
+
+
+def _load_compounds(
+    root: Root, 
+    new: dict[str, Compound], 
+    records: list[tuple[Compound, dict[str, Any]]]
+) -> None:
+    """
+    Restore contents saved by _dump_compound() into placeholder terms.
+    
+    References to keys in new are resolved to the given terms, others are 
+    resolved against root.
+    """
+    def resolve(key: str) -> Any:
+        try:
+            return new[key]
+        except KeyError:
+            return ks_crawl(root, key)
+
+    def load(x: Any) -> Term | Indexical | Var | MatchVar:
+        match x:
+            case str():
+                return resolve(x)
+            case {"this": name}:
+                return Indexical[name]
+            case {"var": name, "sort": sort}:
+                return resolve(sort)(name)
+            case {"match": key, "vars": variables}:
+                return MatchVar(resolve(key), *map(load, variables))
+        raise ValueError(f"Unexpected constituent record {x!r}")
+
+    # Chunks are filled before rules so that rules collect their variables 
+    # from restored chunk dyads; templates are linked last.
+    entries = sorted(records, key=lambda item: isinstance(item[0], Rule))
+    for term, entry in entries:
+        if isinstance(term, Chunk):
+            term._dyads_ = {(load(d), load(v)): w 
+                for d, v, w in entry["dyads"]}
+            term._vars_.update(term._collect_vars_(term._dyads_))
+        if isinstance(term, Rule):
+            term._chunks_ = {resolve(k): w for k, w in entry["chunks"]}
+            term._vars_.update(Chunk._collect_vars_(
+                d for c in term._chunks_ for d in c._dyads_))
+            for chunk in term._chunks_:
+                chunk._rule_ = term
+    for term, entry in entries:
+        term._counter_ = count(entry["counter"])
+        if entry["template"] is not None:
+            template = resolve(entry["template"])
+            template._instances_.add(term)
+            term._template_ = template
+            tvars = {var.name: var for var in template._vars_}
+            term._valuation_ = frozenset((tvars[name], resolve(key)) 
+                for name, key in entry["valuation"])
@@ -125,6 +125,18 @@ class Compound(Term):
         self._template_ = template
         self._counter_ = count()
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_instances_"] = list(self._instances_)
+        state["_counter_"] = n = next(self._counter_)
+        self._counter_ = count(n)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._instances_ = WeakSet(state["_instances_"])
+        self._counter_ = count(state["_counter_"])
+
     def __rxor__(self: Self, other: str) -> Self:
         if not other.isidentifier():
             ValueError("Compound term identifier must be a valid "
@@ -4,7 +4,9 @@ from .keyspaces import (ks_root, ks_parent, ks_crawl, keyform)
 from .indices import Index 
 from .undefined import _Undefined, Undefined
 from .numdicts import NumDict, numdict
+from .ops.profile import OpProfiler
+from .serial import NumDictWriter, NumDictFile
 
 __all__ = ["ValidationError", "Key", "KeyForm", "Index", "NumDict", 
     "ks_root", "ks_parent", "ks_crawl", "keyform", "numdict", "_Undefined", 
-    "Undefined"]
\ No newline at end of file
+    "Undefined", "OpProfiler", "NumDictWriter", "NumDictFile"]
\ No newline at end of file
@@ -65,6 +65,19 @@ class Index[R: KSRoot](KSObserver):
                 leaves.append(i)
         return leaves, heights, keyspaces 
 
+    def __getstate__(self) -> dict:
+        # Observers reregister themselves when copied or unpickled.
+        state = self.__dict__.copy()
+        del state["observers"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.observers = WeakSet()
+        for ksp in self._init(self.root, self.kf)[2]:
+            if isinstance(ksp, KSParent):
+                self.subscribe(ksp)
+
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Index):
             return self.root is other.root and self.kf == other.kf
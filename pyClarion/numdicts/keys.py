@@ -77,6 +77,15 @@ class Key(tuple[tuple[str, int], ...]):
 
     def __repr__(self) -> str:
         return f"Key({repr(str(self))})"
+
+    def __reduce__(self) -> tuple[type["Key"], tuple[str]]:
+        return (type(self), (str(self),))
+
+    def __copy__(self: Self) -> Self:
+        return self
+
+    def __deepcopy__(self: Self, memo: dict) -> Self:
+        return self
     
     def __bool__(self) -> bool:
         return self != Key()
@@ -249,7 +258,16 @@ class KeyForm:
                 raise ValueError("Height vector too short") from e
         if 0 < len(h):
             raise ValueError("Height vector too long")
-            
+
+    def __reduce__(self) -> tuple[type["KeyForm"], tuple[Key, tuple[int, ...]]]:
+        return (type(self), (self.k, self.h))
+
+    def __copy__(self: Self) -> Self:
+        return self
+
+    def __deepcopy__(self: Self, memo: dict) -> Self:
+        return self
+
     def __contains__(self, obj) -> bool:
         if not isinstance(obj, Key):
             return NotImplemented
@@ -222,6 +222,16 @@ class KSParent[M: "KSChild"](KSPath):
             obs.on_del(self, child)
         del self._members_[key]
 
+    def __getstate__(self) -> dict:
+        # Observers resubscribe themselves when copied or unpickled.
+        state = self.__dict__.copy()
+        del state["_observers_"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._observers_ = WeakSet()
+
 
 class KSChild(KSPath):
     """
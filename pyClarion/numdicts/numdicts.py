@@ -2,6 +2,7 @@ from typing import (Mapping, Iterator, Callable, Concatenate, Self,
     SupportsFloat, overload)
 from functools import wraps
 from contextlib import contextmanager
+from copy import deepcopy
 
 import math
 
@@ -30,17 +31,33 @@ def inplace[D: "NumDict", **P, R](
     def wrapper(d: D, *args: P.args, **kwargs: P.kwargs) -> R:
         if d._p: 
             raise RuntimeError("Cannot mutate protected NumDict data.")
+        d._own()
         return f(d, *args, **kwargs)
     return wrapper
 
 
 class NumDictBase(IndexObserver):
-    __slots__ = ("_i", "_d", "_c", "_p")
+    """
+    Base class for numdicts.
+
+    Data dicts may be shared with copies made by copy.deepcopy() (e.g., when 
+    forking a simulated system). Shared data is copied before it is first 
+    mutated in place by either party. Code that writes directly to _d must call 
+    _own() first.
+
+    Numdicts may also be marked aliased (e.g., when recorded by a gradient 
+    tape). Aliased numdicts should be replaced rather than mutated in place by 
+    code that owns the containing data channel.
+    """
+
+    __slots__ = ("_i", "_d", "_c", "_p", "_s", "_a")
 
     _i: Index
     _d: dict[Key, float]
     _c: float | _Undefined
     _p: bool
+    _s: bool
+    _a: bool
 
     def __init__(
         self, 
@@ -57,8 +74,25 @@ class NumDictBase(IndexObserver):
         self._d = d 
         self._c = c
         self._p = True
+        self._s = False
+        self._a = False
         self.register(i)
 
+    def __deepcopy__(self: Self, memo: dict) -> Self:
+        new = type(self)(deepcopy(self._i, memo), self._d, self._c, False)
+        new._s = self._s = True
+        return new
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (self._i, self._d, self._c, False))
+
+    def _own(self) -> dict[Key, float]:
+        """Return data for in-place mutation, copying it first if shared."""
+        if self._s:
+            self._d = self._d.copy()
+            self._s = False
+        return self._d
+
     @property
     def i(self) -> Index:
         return self._i
@@ -234,7 +268,7 @@ class NumDictBase(IndexObserver):
         self._d.update({Key(k): float(v) for k, v in data.items()})
     
     def on_del(self, index: Index, key: Key) -> None:
-        self._d.pop(key, None)
+        self._own().pop(key, None)
 
 
 class NumDict(NumDictBase):
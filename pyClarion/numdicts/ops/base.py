@@ -1,9 +1,11 @@
 from typing import ClassVar, Self, Sequence, Callable, overload
 from inspect import Signature, signature
+from functools import wraps
 from math import isnan
 
 from .funcs import collect, unary, binary, variadic
 from .tape import OpProto, GradientTape
+from .profile import OpProfiler
 from ..keys import KeyForm
 from ..undefined import _Undefined
 from .. import numdicts as nd
@@ -35,6 +37,12 @@ class OpBase[D: "nd.NumDict"]:
     __call__: Callable
     grad: Callable
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        call = vars(cls).get("__call__")
+        if call is not None:
+            cls.__call__ = _profiled(call)
+
     def __set_name__(self, owner: type[D], name: str) -> None:
         self.__name__ = name
         self.__qualname__ = f"{owner.__name__}.{name}"
@@ -61,6 +69,17 @@ class OpBase[D: "nd.NumDict"]:
         self.__signature__ = signature(self.__call__)
 
 
+def _profiled(call: Callable) -> Callable:
+    """Wrap an op call method so that calls are recorded by OpProfiler."""
+    @wraps(call)
+    def __call__(self, *args, **kwargs):
+        profiler = OpProfiler.STACK.get()
+        if profiler is None:
+            return call(self, *args, **kwargs)
+        return profiler.call(self, call, *args, **kwargs)
+    return __call__
+
+
 class Constant[D: "nd.NumDict"](OpBase[D]):
     __slots__ = ("c",)
     c: float
@@ -0,0 +1,247 @@
+from typing import Any, BinaryIO, Iterator, Mapping
+from itertools import accumulate
+from array import array
+from os import PathLike
+import mmap
+import json
+import struct
+
+from .keys import Key, KeyForm
+from .keyspaces import KSRoot
+from .indices import Index
+from .undefined import Undefined
+from .numdicts import NumDict
+
+
+MAGIC = b"PYCLND01"
+TRAILER = struct.Struct("=QQQQ8s")
+"""Key table offset, metadata length, key count, key pair count and magic."""
+
+
+class NumDictWriter:
+    """
+    Streams numdicts to a compact binary file.
+
+    Each numdict written is stored as contiguous int64 key ids and float64
+    values in native byte order, and written out immediately. Keys are
+    encoded once per file in a key table written on close, which stores
+    keys as arrays of interned label ids and node degrees. Index keyforms,
+    default constants and any JSON-serializable entries added to meta are 
+    stored in a JSON directory following the key table.
+
+    Use as a context manager, or call close() explicitly. Read files back with
+    NumDictFile.
+
+    >>> with NumDictWriter("weights.bin") as writer:
+    ...     writer.write("layer.weights", layer.weights[0])
+    """
+
+    file: BinaryIO
+    meta: dict[str, Any]
+
+    def __init__(self, file: str | PathLike) -> None:
+        self.file = open(file, "wb")
+        self.meta = {}
+        self.file.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._keys: dict[Key, int] = {}
+        self._strings: dict[str, int] = {}
+        self._sizes = array("q")
+        self._labels = array("q")
+        self._degrees = array("q")
+        self._records: dict[str, list] = {}
+
+    def __enter__(self) -> "NumDictWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _key(self, key: Key) -> int:
+        try:
+            return self._keys[key]
+        except KeyError:
+            pass
+        strings = self._strings
+        self._sizes.append(len(key))
+        for label, degree in key:
+            self._labels.append(strings.setdefault(label, len(strings)))
+            self._degrees.append(degree)
+        i = self._keys[key] = len(self._keys)
+        return i
+
+    def write(self, name: str, d: NumDict) -> None:
+        """Append d to the file under name."""
+        if name in self._records:
+            raise ValueError(f"Duplicate numdict name '{name}'")
+        data = d._d
+        ids = array("q", map(self._key, data))
+        vals = array("d", data.values())
+        kf = d._i.kf
+        self._records[name] = [self._key(kf.k), list(kf.h), self._offset,
+            len(vals), None if d._c is Undefined else d._c]
+        self.file.write(ids)
+        self.file.write(vals)
+        self._offset += 16 * len(vals)
+
+    def close(self) -> None:
+        """Write the key table and directory, then close the file."""
+        f = self.file
+        if f.closed:
+            return
+        f.write(self._sizes)
+        f.write(self._labels)
+        f.write(self._degrees)
+        meta = json.dumps({"strings": list(self._strings),
+            "records": self._records, "meta": self.meta}, 
+            separators=(",", ":")).encode()
+        f.write(meta)
+        f.write(TRAILER.pack(self._offset, len(meta), len(self._sizes),
+            len(self._labels), MAGIC))
+        f.close()
+
+
+class NumDictFile:
+    """
+    A numdict file written by NumDictWriter, read through a memory map.
+
+    Numdicts are decoded only on request. Keys are decoded once per file,
+    on first use, and values of stored numdicts are available as zero-copy
+    views. Views returned by values() must be released before the file is 
+    closed.
+    """
+
+    names: list[str]
+    meta: dict[str, Any]
+
+    def __init__(self, file: str | PathLike) -> None:
+        with open(file, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._buf
+        start, m, n, p, magic = TRAILER.unpack_from(buf, len(buf) -
+            TRAILER.size)
+        if buf[:len(MAGIC)] != MAGIC or magic != MAGIC:
+            raise ValueError("Not a pyClarion numdict file")
+        self._layout = start, n, p
+        self._map()
+        end = start + 8 * (n + 2 * p)
+        meta = json.loads(buf[end:end + m])
+        self._strings: list[str] = meta["strings"]
+        self._records: dict[str, list] = meta["records"]
+        self._table: list[Key] | None = None
+        self.names = list(self._records)
+        self.meta = meta["meta"]
+
+    def __enter__(self) -> "NumDictFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _map(self) -> None:
+        """Create views of the key table arrays."""
+        start, n, p = self._layout
+        self._view = view = memoryview(self._buf)
+        self._sizes = view[start:start + 8 * n].cast("q")
+        self._labels = view[start + 8 * n:start + 8 * (n + p)].cast("q")
+        self._degrees = view[start + 8 * (n + p):start + 8 * (n + 2 * p)]\
+            .cast("q")
+
+    def close(self) -> None:
+        """
+        Release views and unmap the file.
+        
+        Raises BufferError if views returned by values() are still alive, in 
+        which case the file is left open and usable.
+        """
+        if self._buf.closed:
+            return
+        for v in (self._sizes, self._labels, self._degrees, self._view):
+            v.release()
+        try:
+            self._buf.close()
+        except BufferError as e:
+            self._map()
+            raise BufferError("Cannot close numdict file while views "
+                "returned by values() are alive; release them first") from e
+
+    @property
+    def table(self) -> list[Key]:
+        """Return the key table of the file."""
+        if self._table is None:
+            strings, labels, degrees = self._strings, self._labels, \
+                self._degrees
+            ends = accumulate(self._sizes)
+            table, j = [], 0
+            for end in ends:
+                table.append(tuple.__new__(Key, [(strings[labels[i]],
+                    degrees[i]) for i in range(j, end)]))
+                j = end
+            self._table = table
+        return self._table
+
+    def keyform(self, name: str) -> KeyForm:
+        """Return the index keyform of numdict name."""
+        k, h, *_ = self._records[name]
+        return KeyForm(self.table[k], tuple(h))
+
+    def keys(self, name: str) -> list[Key]:
+        """Return the keys of numdict name, in storage order."""
+        _, _, offset, n, _ = self._records[name]
+        table = self.table
+        return [table[k] for k in
+            self._view[offset:offset + 8 * n].cast("q")]
+
+    def values(self, name: str) -> memoryview:
+        """
+        Return a zero-copy view of the values of numdict name.
+        
+        The view must be released before the file is closed.
+        """
+        _, _, offset, n, _ = self._records[name]
+        return self._view[offset + 8 * n:offset + 16 * n].cast("d")
+
+    def load(self, name: str, i: Index | KSRoot) -> NumDict:
+        """
+        Return numdict name over index i.
+
+        If i is a keyspace root, an index is built over it from the stored
+        keyform. Otherwise the keyform of i must match the stored keyform.
+        """
+        kf = self.keyform(name)
+        if not isinstance(i, Index):
+            i = Index(i, kf)
+        elif i.kf != kf:
+            raise ValueError(f"Keyform of index does not match stored "
+                f"keyform of numdict '{name}'")
+        c = self._records[name][4]
+        return NumDict(i, self.data(name), Undefined if c is None else c)
+
+    def data(self, name: str) -> dict[Key, float]:
+        """Return the data of numdict name as a dict."""
+        values = self.values(name)
+        d = dict(zip(self.keys(name), values))
+        values.release()
+        return d
+
+
+def dump(file: str | PathLike, ds: Mapping[str, NumDict]) -> None:
+    """Write named numdicts to file."""
+    with NumDictWriter(file) as writer:
+        for name, d in ds.items():
+            writer.write(name, d)
+
+
+def load(file: str | PathLike, root: KSRoot) -> dict[str, NumDict]:
+    """Read all numdicts in file, building indexes over root."""
+    with NumDictFile(file) as f:
+        return {name: f.load(name, root) for name in f}
@@ -5,6 +5,8 @@ class _Undefined:
     __slots__ = ()
     def __repr__(self):
         return "Undefined"
-    
+    def __reduce__(self):
+        return "Undefined"
+
 
 Undefined: Final[_Undefined] = _Undefined()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import unittest
+
+from pyClarion import Agent, Input, Layer, Event, Atom, Atoms
+from pyClarion.knowledge import DataFamily, Root
+from pyClarion.events import ForwardUpdate, BackwardUpdate
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+    blu: Atom
+
+
+class Data(DataFamily):
+    color: Color
+    out: Color
+    batch: Atoms
+
+
+class LayerRoot(Root):
+    d: Data
+
+
+class BatchedLayerTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = LayerRoot()
+        self.batch = batch = root.d.batch
+        for _ in range(2):
+            batch[None] = Atom()
+        self.c, self.o = c, o = root.d.color, root.d.out
+        self.samples = [{c.red: 1.0, c.grn: .5}, {c.blu: -1.0, c.red: .25}]
+        with Agent("agent", root) as self.agent:
+            self.ipt_b = Input("ipt_b", c, b=batch)
+            self.layer_b = Layer("layer_b", c, o, b=batch)
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, o)
+        self.ipt_b >> self.layer_b
+        self.ipt >> self.layer
+        with self.layer_b.weights[0].mutable() as wb, \
+            self.layer.weights[0].mutable() as w:
+            for i, k in enumerate(self.layer.weights.index):
+                wb[k] = w[k] = .1 * i
+
+    def run_event(self, event: Event) -> None:
+        self.agent.system.schedule(event)
+        self.agent.run_all()
+
+    def test_batched_forward_matches_samples(self) -> None:
+        self.run_event(self.ipt_b.send_batch(self.samples))
+        main_b = self.layer_b.main[0]
+        for name, sample in zip(self.batch, self.samples):
+            self.run_event(self.ipt.send(sample))
+            main = self.layer.main[0]
+            for k in main:
+                self.assertAlmostEqual(main[k], main_b[~self.batch[name] * k])
+
+    def test_batched_gradients_are_averaged(self) -> None:
+        o = self.o
+        self.run_event(self.ipt_b.send_batch(self.samples))
+        g = {~self.batch[name] * ~o.red: 1.0 for name in self.batch}
+        self.run_event(Event(self.agent.breakpoint, 
+            [BackwardUpdate(self.layer_b.main, g)]))
+        for sample in self.samples:
+            self.run_event(self.ipt.send(sample))
+            g = {~o.red: 1 / len(self.samples)}
+            self.run_event(Event(self.agent.breakpoint, 
+                [BackwardUpdate(self.layer.main, g)]))
+        for site_b, site in [(self.layer_b.weights, self.layer.weights),
+            (self.layer_b.bias, self.layer.bias)]:
+            for k in site.index:
+                self.assertAlmostEqual(site_b.grad[0][k], site.grad[0][k])
+
+    def test_partial_batch_gradients_are_averaged_over_samples(self) -> None:
+        o, name = self.o, next(iter(self.batch))
+        self.run_event(self.ipt_b.send_batch(self.samples[:1]))
+        g = {~self.batch[name] * ~o.red: 1.0}
+        self.run_event(Event(self.agent.breakpoint, 
+            [BackwardUpdate(self.layer_b.main, g)]))
+        self.run_event(self.ipt.send(self.samples[0]))
+        self.run_event(Event(self.agent.breakpoint, 
+            [BackwardUpdate(self.layer.main, {~o.red: 1.0})]))
+        for site_b, site in [(self.layer_b.weights, self.layer.weights),
+            (self.layer_b.bias, self.layer.bias)]:
+            for k in site.index:
+                self.assertAlmostEqual(site_b.grad[0][k], site.grad[0][k])
+
+
+    def test_taped_input_unchanged_by_trusted_add(self) -> None:
+        c, o = self.c, self.o
+        self.run_event(self.ipt.send(self.samples[0]))
+        input = self.layer.input[0]
+        ForwardUpdate(self.layer.input, {~c.red: 5.0}, "add", True).apply()
+        self.assertIsNot(self.layer.input[0], input)
+        self.assertEqual(input[~c.red], 1.0)
+        self.run_event(Event(self.agent.breakpoint, 
+            [BackwardUpdate(self.layer.main, {~o.red: 1.0})]))
+        g_w = self.layer.weights.grad[0]
+        for k, v in self.samples[0].items():
+            self.assertAlmostEqual(g_w[~k * ~o.red], v)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import gc
+
+from pyClarion import Agent, Input, Layer, Event, Atom, Atoms
+from pyClarion.knowledge import DataFamily, Root
+from pyClarion.events import BackwardUpdate, State
+from pyClarion.components import SGD, Adam, LazyAdam
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+    blu: Atom
+
+
+class Data(DataFamily):
+    color: Color
+    out: Color
+
+
+class OptRoot(Root):
+    d: Data
+    p: DataFamily
+
+
+class LazyAdamTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = OptRoot()
+        self.c, self.o = c, o = root.d.color, root.d.out
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.l1 = Layer("l1", c, o)
+            self.l2 = Layer("l2", c, o)
+            self.adam = Adam("adam", root.p)
+            self.lazy = LazyAdam("lazy", root.p)
+        self.ipt >> self.l1
+        self.ipt >> self.l2
+        self.adam.add(self.l1.weights, self.l1.bias)
+        self.lazy.add(self.l2.weights, self.l2.bias)
+
+    def step(self, x: dict, g: dict) -> None:
+        system = self.agent.system
+        system.schedule(self.ipt.send(x))
+        system.run_all()
+        system.schedule(Event(self.agent.breakpoint,
+            [BackwardUpdate(self.l1.main, g),
+             BackwardUpdate(self.l2.main, g)]))
+        system.run_all()
+        system.schedule(self.adam.update())
+        system.schedule(self.lazy.update())
+        system.run_all()
+
+    def test_dense_gradients_match_adam(self) -> None:
+        c, o = self.c, self.o
+        for i in range(5):
+            self.step({c.red: 1.0 + i, c.blu: -.5}, {~o.red: .3, ~o.grn: -i})
+        for s1, s2 in [(self.l1.weights, self.l2.weights),
+            (self.l1.bias, self.l2.bias)]:
+            for k in s1.index:
+                self.assertAlmostEqual(s1[0][k], s2[0][k])
+
+    def test_inactive_keys_untouched(self) -> None:
+        c, o = self.c, self.o
+        self.step({c.red: 1.0}, {~o.red: 1.0})
+        before = self.l2.weights[0].d
+        self.step({c.blu: 1.0}, {~o.grn: 1.0})
+        after = self.l2.weights[0]
+        for k, v in before.items():
+            self.assertEqual(after[k], v)
+        self.assertNotEqual(self.l1.weights[0][~c.red * ~o.red],
+            before[~c.red * ~o.red])
+
+
+class LaggedLazyAdamTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = OptRoot()
+        self.c, self.o = c, o = root.d.color, root.d.out
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, o, l=2)
+            self.lazy = LazyAdam("lazy", root.p)
+        self.ipt >> self.layer
+        self.lazy.add(self.layer.weights, self.layer.bias)
+        with self.layer.weights[0].mutable() as w:
+            for i, k in enumerate(self.layer.weights.index):
+                w[k] = .1 * (i + 1)
+
+    def run_event(self, event: Event) -> None:
+        self.agent.system.schedule(event)
+        self.agent.system.run_all()
+
+    def test_lagged_backward_after_step(self) -> None:
+        c, o = self.c, self.o
+        self.run_event(self.ipt.send({c.red: 1.0}))
+        self.run_event(self.ipt.send({c.blu: 1.0}))
+        _, _, (_, taped, _) = self.layer.tapes[-1]
+        before = taped.d
+        g = {~o.red: 1.0}
+        self.run_event(Event(self.agent.breakpoint,
+            [BackwardUpdate(self.layer.main, g)]))
+        self.run_event(self.lazy.update())
+        self.assertEqual(taped.d, before)
+        self.assertNotEqual(self.layer.weights[0].d, before)
+        self.run_event(Event(self.agent.breakpoint,
+            [BackwardUpdate(self.layer.main, g)]))
+        g_i = self.ipt.main.grad[0]
+        for k in self.ipt.main.index:
+            self.assertAlmostEqual(g_i[k], before[k * ~o.red])
+
+
+class GradientSyncTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = OptRoot()
+        self.c, self.o = c, o = root.d.color, root.d.out
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, o)
+            self.sgd = SGD("sgd", root.p, lr=1.0, sync=2)
+        self.ipt >> self.layer
+        self.sgd.add(self.layer.weights, self.layer.bias)
+
+    def backward(self) -> None:
+        system = self.agent.system
+        system.schedule(self.ipt.send({self.c.red: 1.0}))
+        system.run_all()
+        system.schedule(Event(self.agent.breakpoint,
+            [BackwardUpdate(self.layer.main, {~self.o.red: 1.0})]))
+        system.run_all()
+
+    def test_update_every_sync_events(self) -> None:
+        key = ~self.o.red
+        self.backward()
+        self.assertEqual(self.layer.bias.grad[0][key], 1.0)
+        self.assertEqual(self.layer.bias[0][key], 0.0)
+        self.backward()
+        self.assertEqual(self.layer.bias.grad[0][key], 0.0)
+        self.assertEqual(self.layer.bias[0][key], -2.0)
+
+
+class OptimizerMemoryTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = OptRoot()
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", root.d.color)
+            self.lazy = LazyAdam("lazy", root.p)
+        self.index = self.ipt.main.index
+
+    def test_remove_releases_buffers(self) -> None:
+        s1, s2 = State(self.index, {}, 0.0), State(self.index, {}, 0.0)
+        self.lazy.add(s1, s2)
+        self.lazy.remove(s1)
+        self.assertEqual(set(self.lazy.memory()), {s2})
+        self.assertNotIn(s1, self.lazy.m1)
+        self.assertNotIn(s1, self.lazy.last)
+
+    def test_unreferenced_sites_are_dropped(self) -> None:
+        s = State(self.index, {}, 0.0)
+        self.lazy.add(s)
+        self.assertEqual(len(self.lazy.sites), 1)
+        del s
+        gc.collect()
+        self.assertEqual(len(self.lazy.sites), 0)
+        self.assertEqual(len(self.lazy.m1), 0)
+        self.assertEqual(len(self.lazy.t), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
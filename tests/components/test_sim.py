@@ -0,0 +1,133 @@
+import unittest
+from datetime import timedelta
+from typing import Any
+
+import random
+
+from pyClarion import Agent, Environment, Sweep, Input, Layer, Atom, Atoms
+from pyClarion.knowledge import DataFamily, Root
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+
+
+class Data(DataFamily):
+    color: Color
+
+
+class SimRoot(Root):
+    d: Data
+
+
+class LayerAgent(Agent):
+
+    def __init__(self, name: str, scale: float) -> None:
+        root = SimRoot()
+        super().__init__(name, root)
+        self.c = c = root.d.color
+        with self:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, c)
+        self.ipt >> self.layer
+        with self.layer.weights[0].mutable() as w:
+            for k in self.layer.weights.index:
+                w[k] = scale
+
+    def receive(self, message: Any) -> None:
+        data = {self.c[name]: v for name, v in message.items()}
+        self.system.schedule(self.ipt.send(data, dt=timedelta(milliseconds=5)))
+
+    def report(self) -> Any:
+        return (self.system.clock.time, 
+            {str(k): v for k, v in self.layer.main[0].d.items()})
+
+
+def make_agent(name: str, scale: float) -> LayerAgent:
+    return LayerAgent(name, scale)
+
+
+def replicate(scale: float) -> dict[str, float]:
+    agent = make_agent("agent", scale)
+    agent.receive({"red": random.random()})
+    agent.run_all()
+    return {"out": sum(agent.layer.main[0].d.values())}
+
+
+class SweepTestCase(unittest.TestCase):
+
+    def test_pool_matches_serial(self) -> None:
+        grid = Sweep.product(scale=[1.0, 2.0])
+        serial = list(Sweep(replicate, grid, reps=3, workers=0).run())
+        pooled = list(Sweep(replicate, grid, reps=3, workers=2).run())
+        self.assertEqual(len(pooled), 6)
+        self.assertEqual(
+            sorted((r.index, r.result["out"]) for r in serial),
+            sorted((r.index, r.result["out"]) for r in pooled))
+        summary = Sweep.summarize(pooled)
+        self.assertEqual([s["params"] for s in summary], grid)
+        self.assertEqual([s["n"] for s in summary], [3, 3])
+        outs = [r.result["out"] for r in serial]
+        self.assertAlmostEqual(summary[1]["out"]["mean"], sum(outs[3:]) / 3)
+
+
+class RemoteAgentTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.env = Environment("env", SimRoot())
+        self.addCleanup(self.env.close)
+
+    def test_sync(self) -> None:
+        env = self.env
+        env.spawn("a1", make_agent, "a1", 1.0)
+        env.spawn("a2", make_agent, "a2", 2.0)
+        dt = timedelta(milliseconds=10)
+        reports = env.sync(dt, {"a1": {"red": 1.0}, "a2": {"red": 1.0}})
+        local = make_agent("local", 2.0)
+        local.receive({"red": 1.0})
+        local.system.run_until(dt)
+        self.assertEqual(reports["a2"], local.report())
+        self.assertEqual(reports["a1"][0], dt)
+        self.assertEqual(env.system.clock.time, dt)
+        reports = env.sync(dt)
+        self.assertEqual(reports["a1"][0], 2 * dt)
+
+    def test_branch(self) -> None:
+        env = self.env
+        local = make_agent("local", 2.0)
+        local.receive({"red": 1.0})
+        local.run_all()
+        env.branch("b1", local)
+        env.branch("b2", local)
+        dt = timedelta(milliseconds=10)
+        reports = env.sync(dt, {"b1": {"red": 1.0}, "b2": {"grn": 3.0}})
+        fork = local.fork()
+        fork.receive({"grn": 3.0})
+        fork.system.run_until(dt)
+        self.assertEqual(reports["b2"], fork.report())
+        self.assertNotEqual(reports["b1"], reports["b2"])
+        self.assertEqual(local.system.clock.time, timedelta(milliseconds=5))
+
+    def test_remote_errors(self) -> None:
+        env = self.env
+        env.spawn("a1", make_agent, "a1", 1.0)
+        with self.assertRaises(RuntimeError):
+            env.sync(timedelta(), {"a1": {"blu": 1.0}})
+
+    def test_remote_errors_drained(self) -> None:
+        env = self.env
+        for name in ("a1", "a2", "a3"):
+            env.spawn(name, make_agent, name, 1.0)
+        with self.assertRaises(RuntimeError) as cm:
+            env.sync(timedelta(), {"a1": {"blu": 1.0}, "a3": {"blu": 1.0}})
+        self.assertIn("'a1'", str(cm.exception))
+        self.assertIn("'a3'", str(cm.exception))
+        self.assertNotIn("'a2'", str(cm.exception))
+        dt = timedelta(milliseconds=10)
+        reports = env.sync(dt)
+        self.assertEqual({r[0] for r in reports.values()}, {dt})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import tempfile
+import os
+
+from pyClarion import Agent, ChunkStore, Input, Atom, Atoms
+from pyClarion.components.chunks import ChunkExtractor
+from pyClarion.components.rules import RuleStore
+from pyClarion.knowledge import (DataFamily, ChunkFamily, RuleFamily, 
+    BusFamily, Buses, Bus, Root)
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+    blu: Atom
+
+
+class Main(Buses):
+    input: Bus
+
+
+class B(BusFamily):
+    main: Main
+
+
+class D(DataFamily):
+    color: Color
+
+
+class StoreRoot(Root):
+    b: B
+    d: D
+    p: DataFamily
+    c: ChunkFamily
+    r: RuleFamily
+
+
+class Model(Agent):
+
+    def __init__(self) -> None:
+        self.root = root = StoreRoot()
+        super().__init__("agent", root)
+        with self:
+            self.chunks = ChunkStore("chunks", root.c, (root.b, root.d))
+            self.rules = RuleStore("rules", root.r, self.chunks.c, 
+                self.chunks.c)
+            self.ipt = Input("ipt", (root.b, root.d))
+            self.bu = self.chunks.bottom_up("bu")
+            self.extractor = ChunkExtractor("extractor", root.p, 
+                self.chunks.c, (root.b, root.d))
+        self.ipt >> self.bu
+        self.bu >> self.extractor
+
+    def encode(self) -> None:
+        main, color = self.root.b.main, self.root.d.color
+        self.system.schedule(self.chunks.encode(
+            "red" ^ + main.input ** color.red,
+            "grn" ^ + main.input ** color.grn))
+        self.run_all()
+        self.system.schedule(self.rules.encode(
+            "flip" ^ (+ main.input ** color.red >> + main.input ** color.grn)))
+        self.run_all()
+
+    def extract(self, value: Atom) -> set[str]:
+        """Present value on main.input and return newly extracted chunks."""
+        main = self.root.b.main
+        names = set(self.chunks.c)
+        self.system.schedule(self.ipt.send({~main.input * ~value: 1.0}))
+        self.run_all()
+        return set(self.chunks.c) - names
+
+
+class StoreTestCase(unittest.TestCase):
+
+    def test_save_load(self) -> None:
+        m1 = Model()
+        m1.encode()
+        m2 = Model()
+        with tempfile.TemporaryDirectory() as d:
+            p1, p2 = os.path.join(d, "c.bin"), os.path.join(d, "r.bin")
+            m1.chunks.save(p1)
+            m1.rules.save(p2)
+            m2.system.schedule(m2.chunks.load(p1))
+            m2.run_all()
+            m2.system.schedule(m2.rules.load(p2))
+            m2.run_all()
+        self.assertEqual(set(m2.chunks.c), set(m1.chunks.c))
+        self.assertEqual(set(m2.rules.r), set(m1.rules.r))
+        for name in ("ciw", "tdw", "buw"):
+            s1, s2 = getattr(m1.chunks, name), getattr(m2.chunks, name)
+            self.assertEqual({str(k): v for k, v in s1[0].d.items()}, 
+                {str(k): v for k, v in s2[0].d.items()})
+        for name in ("bias", "riw", "lhw", "rhw"):
+            s1, s2 = getattr(m1.rules, name), getattr(m2.rules, name)
+            self.assertEqual({str(k): v for k, v in s1[0].d.items()}, 
+                {str(k): v for k, v in s2[0].d.items()})
+        for s1, s2 in [(m1.chunks.c, m2.chunks.c), (m1.rules.r, m2.rules.r)]:
+            for name in s1:
+                self.assertEqual(str(s1[name]), str(s2[name]))
+        self.assertIs(m2.chunks.c["flip_0"]._rule_, m2.rules.r["flip"])
+        for m in (m1, m2):
+            color = m.root.d.color
+            self.assertEqual(m.extract(color.red), set())
+            self.assertEqual(len(m.extract(color.blu)), 1)
+            self.assertEqual(m.extract(color.blu), set())
+        self.assertEqual(set(m2.chunks.c), set(m1.chunks.c))
+
+
+if __name__ == "__main__":
+    unittest.main()
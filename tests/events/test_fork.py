@@ -0,0 +1,87 @@
+import unittest
+from datetime import timedelta
+
+from pyClarion import Agent, Input, Layer, ChunkStore, Event, Atom, Atoms
+from pyClarion.knowledge import (DataFamily, ChunkFamily, BusFamily, Buses,
+    Bus, Root)
+from pyClarion.components import SGD
+from pyClarion.events import BackwardUpdate
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+
+
+class Main(Buses):
+    input: Bus
+
+
+class B(BusFamily):
+    main: Main
+
+
+class D(DataFamily):
+    color: Color
+
+
+class ForkRoot(Root):
+    b: B
+    d: D
+    c: ChunkFamily
+    p: DataFamily
+
+
+class Model(Agent):
+
+    def __init__(self) -> None:
+        self.root = root = ForkRoot()
+        super().__init__("agent", root)
+        with self:
+            self.ipt = Input("ipt", (root.b, root.d))
+            self.chunks = ChunkStore("chunks", root.c, (root.b, root.d))
+            self.bu = self.ipt >> self.chunks.bottom_up("bu")
+            self.layer = Layer("layer", (root.b, root.d), (root.b, root.d))
+            self.sgd = SGD("sgd", root.p, sync=1)
+        self.ipt >> self.layer
+        self.sgd.add(self.layer.weights, self.layer.bias)
+        main, color = root.b.main, root.d.color
+        self.system.schedule(self.chunks.encode(
+            "one" ^ + main.input ** color.red))
+        self.run_all()
+
+    def step(self, name: str) -> None:
+        main, color = self.root.b.main, self.root.d.color
+        key = ~main.input * ~color[name]
+        self.system.schedule(self.ipt.send({key: 1.0}))
+        self.run_all()
+        self.system.schedule(Event(self.breakpoint,
+            [BackwardUpdate(self.layer.main, {key: 1.0})]))
+        self.run_all()
+
+
+class ForkTestCase(unittest.TestCase):
+
+    def test_fork_is_independent(self) -> None:
+        m1 = Model()
+        m1.step("red")
+        weights = m1.layer.weights[0].d
+        m2 = m1.fork()
+        self.assertIsNot(m2.system, m1.system)
+        self.assertIs(m2.layer.weights[0]._d, m1.layer.weights[0]._d)
+        m2.step("grn")
+        main, color = m2.root.b.main, m2.root.d.color
+        m2.system.schedule(m2.chunks.encode(
+            "two" ^ + main.input ** color.grn))
+        m2.run_all()
+        self.assertEqual(m1.layer.weights[0].d, weights)
+        self.assertNotEqual(m2.layer.weights[0].d, weights)
+        self.assertEqual(set(m1.chunks.c), {"nil", "one"})
+        self.assertEqual(set(m2.chunks.c), {"nil", "one", "two"})
+        m1.step("grn")
+        self.assertEqual(m1.layer.weights[0].d, m2.layer.weights[0].d)
+        self.assertEqual(m1.system.clock.time, m2.system.clock.time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import tempfile
+import os
+import math
+
+from pyClarion import Agent, Input, Layer, Atom, Atoms
+from pyClarion.knowledge import DataFamily, Root
+from pyClarion.events import SiteRecorder, read_sites
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+
+
+class Data(DataFamily):
+    color: Color
+
+
+class RecordRoot(Root):
+    d: Data
+
+
+class SiteRecorderTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = RecordRoot()
+        self.c = c = root.d.color
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, c)
+        self.ipt >> self.layer
+        with self.layer.weights[0].mutable() as w:
+            for k in self.layer.weights.index:
+                w[k] = 1.0
+
+    def simulate(self, n: int) -> list[dict]:
+        system, c = self.agent.system, self.c
+        values = []
+        for v in range(n):
+            system.schedule(self.ipt.send({c.red: float(v)}))
+            system.run_all()
+            d = self.layer.main[0]
+            values.append({k: d[k] for k in d.i})
+        return values
+
+    def test_ring(self) -> None:
+        rec = SiteRecorder(self.agent.system, self.layer.main, rows=3)
+        with rec:
+            values = self.simulate(5)
+        record = rec.record(self.layer.main)
+        self.assertEqual(len(record.times), 3)
+        self.assertEqual(set(record.keys), set(self.layer.main.index))
+        for i, expected in enumerate(values[2:]):
+            row = record.row(i)
+            for k, v in expected.items():
+                self.assertEqual(row[k], v)
+        self.assertEqual(list(record.column(~self.c.grn)), [2.0, 3.0, 4.0])
+        self.assertEqual(record.times, sorted(record.times))
+
+    def test_decimated_file(self) -> None:
+        main = self.layer.main
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "sites.bin")
+            with SiteRecorder(self.agent.system, main, self.ipt.main, rows=2, 
+                every=2, file=path):
+                values = self.simulate(7)
+            records = read_sites(path)
+        self.assertEqual(set(records), {"layer.main", "ipt.main"})
+        record = records["layer.main"]
+        self.assertEqual(len(record.times), 4)
+        self.assertEqual(list(record.column(~self.c.grn)),
+            [v[~self.c.grn] for v in values[::2]])
+        ipt = records["ipt.main"]
+        self.assertTrue(all(not math.isnan(v) for v in ipt.values))
+
+
+if __name__ == "__main__":
+    unittest.main()
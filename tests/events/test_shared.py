@@ -0,0 +1,81 @@
+import unittest
+import multiprocessing as mp
+
+from pyClarion import Agent, Input, Layer, Atom, Atoms
+from pyClarion.knowledge import DataFamily, Root
+from pyClarion.events import SharedSites, SharedSiteReader
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+
+
+class Data(DataFamily):
+    color: Color
+
+
+class SharedRoot(Root):
+    d: Data
+
+
+def observe(name: str):
+    with SharedSiteReader(name) as reader:
+        return reader.read()
+
+
+class SharedSitesTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = SharedRoot()
+        self.c = c = root.d.color
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, c)
+        self.ipt >> self.layer
+        with self.layer.weights[0].mutable() as w:
+            for k in self.layer.weights.index:
+                w[k] = 2.0
+
+    def send(self, v: float) -> None:
+        system = self.agent.system
+        system.schedule(self.ipt.send({self.c.red: v}))
+        system.run_all()
+
+    def test_publish(self) -> None:
+        main = self.layer.main
+        with SharedSites(self.agent.system, main) as shared:
+            name = shared.names["layer.main"]
+            reader = SharedSiteReader(name)
+            self.addCleanup(reader.close)
+            self.assertEqual(reader.read()[1], {k: 0.0 for k in main.index})
+            self.send(1.0)
+            time, data = reader.read()
+            self.assertEqual(time, self.agent.system.clock.time)
+            self.assertEqual(data, {k: main[0][k] for k in main.index})
+            view = reader.view()
+            self.assertEqual(list(view), [data[k] for k in reader.keys])
+            view.release()
+            ctx = mp.get_context("spawn")
+            with ctx.Pool(1) as pool:
+                remote = pool.apply(observe, (name,))
+            self.assertEqual(remote, (time, data))
+            self.send(2.0)
+            self.assertEqual(reader.read()[1][~self.c.grn], 
+                main[0][~self.c.grn])
+
+
+    def test_default_prefixes_unique(self) -> None:
+        main = self.layer.main
+        with SharedSites(self.agent.system, main) as s1, \
+            SharedSites(self.agent.system, main) as s2:
+            self.assertNotEqual(s1.names["layer.main"], s2.names["layer.main"])
+            self.send(1.0)
+            for shared in (s1, s2):
+                with SharedSiteReader(shared.names["layer.main"]) as reader:
+                    self.assertEqual(reader.read()[1], 
+                        {k: main[0][k] for k in main.index})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+import tempfile
+import os
+from datetime import timedelta
+
+from pyClarion import Agent, Input, Layer, ChunkStore, Atom, Atoms
+from pyClarion.knowledge import (DataFamily, ChunkFamily, BusFamily, Buses, 
+    Bus, Root)
+from pyClarion.components.stats import BaseLevel
+from pyClarion.components import LazyAdam
+from pyClarion.events import (save, load, ForwardUpdate, BackwardUpdate, 
+    Event)
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+
+
+class Main(Buses):
+    input: Bus
+
+
+class B(BusFamily):
+    main: Main
+
+
+class D(DataFamily):
+    color: Color
+
+
+class SnapRoot(Root):
+    b: B
+    d: D
+    c: ChunkFamily
+    p: DataFamily
+    e: DataFamily
+
+
+class Model:
+
+    def __init__(self) -> None:
+        self.root = root = SnapRoot()
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", (root.b, root.d))
+            self.chunks = ChunkStore("chunks", root.c, (root.b, root.d))
+            self.bu = self.ipt >> self.chunks.bottom_up("bu")
+            self.layer = Layer("layer", (root.b, root.d), (root.b, root.d))
+            self.bla = BaseLevel("bla", root.p, root.e, self.chunks.c)
+            self.opt = LazyAdam("opt", root.p)
+        self.ipt >> self.layer
+        self.bu >> self.bla
+        self.opt.add(self.layer.weights, self.layer.bias)
+
+    def start(self) -> None:
+        main, color = self.root.b.main, self.root.d.color
+        system = self.agent.system
+        system.schedule(self.chunks.encode(
+            "one" ^ + main.input ** color.red,
+            "two" ^ + main.input ** color.grn))
+        system.run_all()
+        system.schedule(self.ipt.send({~main.input * ~color.red: 1.0}))
+        system.schedule(self.bla.trigger(dt=timedelta(milliseconds=7)))
+        system.advance()
+
+    def finish(self) -> None:
+        main, color = self.root.b.main, self.root.d.color
+        system = self.agent.system
+        system.run_all()
+        system.schedule(self.ipt.send({~main.input * ~color.grn: 1.0}, 
+            dt=timedelta(milliseconds=3)))
+        system.schedule(self.bla.trigger(dt=timedelta(milliseconds=5)))
+        system.run_all()
+
+    def train(self, color: Atom) -> None:
+        main = self.root.b.main
+        key = ~main.input * ~color
+        system = self.agent.system
+        system.schedule(self.ipt.send({key: 1.0}))
+        system.run_all()
+        system.schedule(Event(self.agent.breakpoint, 
+            [BackwardUpdate(self.layer.main, {key: 1.0})]))
+        system.run_all()
+        system.schedule(self.opt.update())
+        system.run_all()
+
+
+class SnapshotTestCase(unittest.TestCase):
+
+    def test_round_trip(self) -> None:
+        m1, m2 = Model(), Model()
+        m1.start()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "snap.bin")
+            save(m1.agent.system, path)
+            load(m2.agent.system, path)
+        s1, s2 = m1.agent.system, m2.agent.system
+        self.assertEqual(len(s1.queue), len(s2.queue))
+        self.assertEqual(s1.clock.time, s2.clock.time)
+        self.assertEqual(set(m1.chunks.c), set(m2.chunks.c))
+        for name in m1.chunks.c:
+            self.assertEqual(str(m1.chunks.c[name]), str(m2.chunks.c[name]))
+        m1.finish()
+        m2.finish()
+        self.assertEqual(s1.clock.time, s2.clock.time)
+        for p1, p2 in [(m1.bu, m2.bu), (m1.layer, m2.layer), (m1.bla, m2.bla)]:
+            self.assertEqual(p1.main[0].d, p2.main[0].d)
+        self.assertEqual(set(m1.bla.e), set(m2.bla.e))
+
+    def test_optimizer_buffers(self) -> None:
+        m1, m2 = Model(), Model()
+        color = m1.root.d.color
+        m1.train(color.red)
+        m1.train(color.grn)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "snap.bin")
+            save(m1.agent.system, path)
+            load(m2.agent.system, path)
+        for m in (m1, m2):
+            m.train(m.root.d.color.red)
+        w1, w2 = m1.layer.weights[0], m2.layer.weights[0]
+        self.assertEqual(w1.d, w2.d)
+        self.assertEqual(m1.opt.t[m1.layer.weights], 
+            m2.opt.t[m2.layer.weights])
+
+
+    def test_pending_updates(self) -> None:
+        m1, m2 = Model(), Model()
+        main, color = m1.root.b.main, m1.root.d.color
+        key = ~main.input * ~color.red
+        s1, s2 = m1.agent.system, m2.agent.system
+        m1.train(color.red)
+        s1.schedule(Event(m1.agent.breakpoint, 
+            [BackwardUpdate(m1.layer.main, {key: 1.0})]))
+        s1.run_all()
+        s1.schedule(m1.opt.update())
+        s1.schedule(m1.chunks.encode("three" ^ + main.input ** color.grn))
+        s1.schedule(Event(m1.agent.breakpoint, 
+            [ForwardUpdate(m1.ipt.main, {key: 1.0}, "write", True)]))
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "snap.bin")
+            save(s1, path)
+            load(s2, path)
+        for e1, e2 in zip(sorted(s1.queue), sorted(s2.queue)):
+            for u1, u2 in zip(e1.updates, e2.updates):
+                self.assertIs(type(u1), type(u2))
+                self.assertEqual(getattr(u1, "trusted", None), 
+                    getattr(u2, "trusted", None))
+        s1.run_all()
+        s2.run_all()
+        self.assertEqual(m1.layer.weights[0].d, m2.layer.weights[0].d)
+        self.assertEqual(m1.ipt.main[0].d, m2.ipt.main[0].d)
+        self.assertEqual(str(m1.chunks.c["three"]), 
+            str(m2.chunks.c["three"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
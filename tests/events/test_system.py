@@ -0,0 +1,392 @@
+import unittest
+import tempfile
+import random
+import csv
+import os
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import timedelta
+
+from pyClarion import Agent, Input, Layer, Event, Atom, Atoms
+from pyClarion.knowledge import DataFamily, Root
+from pyClarion.numdicts import Key
+from pyClarion.events import Process, ForwardUpdate, HeapQueue, BucketQueue
+from pyClarion.events import Clock, BackwardUpdate, Profiler, State
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+
+
+class Data(DataFamily):
+    color: Color
+
+
+class DispatchRoot(Root):
+    d: Data
+
+
+class Listener(Process):
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.seen = []
+
+    def resolve(self, event: Event) -> None:
+        self.seen.append(event)
+
+
+class Reader(Process):
+    def __init__(self, name: str, site: State) -> None:
+        super().__init__(name)
+        self.site = site
+        self.seen = []
+
+    def resolve(self, event: Event) -> None:
+        self.seen.append(self.site[0].d)
+
+
+class DispatchTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = DispatchRoot()
+        c = root.d.color
+        with Agent("agent", root) as self.agent:
+            self.ipt1 = Input("ipt1", c)
+            self.ipt2 = Input("ipt2", c)
+            self.layer = Layer("layer", c, c)
+            self.listener = Listener("listener")
+        self.system = self.agent.system
+
+    def test_routing(self) -> None:
+        system = self.system
+        event = Event(self.agent.breakpoint, 
+            [ForwardUpdate(self.ipt1.main, {})])
+        self.assertEqual(system.dispatch(event), [self.listener])
+        self.ipt1 >> self.layer
+        self.assertEqual(system.dispatch(event), [self.layer, self.listener])
+        self.ipt2 >> self.layer
+        self.assertEqual(system.dispatch(event), [self.listener])
+
+    def test_unrouted_processes_skipped(self) -> None:
+        self.assertNotIn(self.ipt1, self.system.listeners)
+        self.assertNotIn(self.layer, self.system.listeners)
+        self.assertIn(self.listener, self.system.listeners)
+
+    def test_source_subscription(self) -> None:
+        system = self.system
+        self.listener.subscribe(self.agent.breakpoint)
+        self.assertEqual(system.dispatch(self.ipt1.send({})), [])
+        self.assertEqual(system.dispatch(self.agent.breakpoint(timedelta())), 
+            [self.listener])
+        self.listener.unsubscribe(self.agent.breakpoint)
+        self.assertEqual(system.dispatch(self.agent.breakpoint(timedelta())), [])
+
+    def test_lazy_index(self) -> None:
+        fwd = ForwardUpdate(self.ipt1.main, {})
+        event = Event(self.agent.breakpoint, [fwd])
+        self.assertEqual(event.index(BackwardUpdate), {})
+        self.assertIsNone(event._index)
+        self.assertEqual(event.index(ForwardUpdate), {self.ipt1.main: [fwd]})
+        bwd = BackwardUpdate(self.layer.main, {})
+        event.append(bwd)
+        self.assertEqual(event.index(BackwardUpdate), {self.layer.main: [bwd]})
+        self.assertEqual(event.index(ForwardUpdate), {self.ipt1.main: [fwd]})
+
+
+class RingStateTestCase(unittest.TestCase):
+
+    def test_push_recycles(self) -> None:
+        root = DispatchRoot()
+        c = root.d.color
+        with Agent("agent", root):
+            ipt = Input("ipt", c)
+        state = State(ipt.main.index, {}, 0.0, l=2, ring=True)
+        buffers = {id(d) for d in state.data}
+        for v in (1.0, 2.0, 3.0):
+            ForwardUpdate(state, {~c.red: v}).apply()
+        self.assertEqual({id(d) for d in state.data}, buffers)
+        self.assertEqual([d[~c.red] for d in state.data], [3.0, 2.0])
+        copy = deepcopy(state)
+        ForwardUpdate(copy, {~c.grn: 1.0}).apply()
+        self.assertEqual([d[~c.red] for d in state.data], [3.0, 2.0])
+        self.assertEqual(copy[0].d, {~c.grn: 1.0})
+        with self.assertRaises(ValueError):
+            ForwardUpdate(state, {"x": 1.0}).apply()
+
+
+class StateUpdateTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = DispatchRoot()
+        self.c = c = root.d.color
+        with Agent("agent", root):
+            self.ipt = Input("ipt", c)
+
+    def test_trusted_matches_validated(self) -> None:
+        c, index = self.c, self.ipt.main.index
+        states = [State(index, {}, 0.0) for _ in range(2)]
+        for trusted, state in zip((False, True), states):
+            buffer = state[0]
+            ForwardUpdate(state, {~c.red: 1.0}, "write", trusted).apply()
+            ForwardUpdate(state, {~c.red: -1.0, ~c.grn: 2.0}, "add", 
+                trusted).apply()
+            ForwardUpdate(state, state.new({~c.grn: 1.0}), "add").apply()
+            self.assertEqual(state[0] is buffer, trusted)
+        self.assertEqual(states[0][0].d, {~c.grn: 3.0})
+        self.assertEqual(states[1][0].d, states[0][0].d)
+        with self.assertRaises(ValueError):
+            ForwardUpdate(states[0], {Key("x"): 1.0}, "write").apply()
+
+    def test_gradient_adds(self) -> None:
+        c, index = self.c, self.ipt.main.index
+        states = [State(index, {}, 0.0) for _ in range(2)]
+        for state in states:
+            buffer = state.grad[0]
+            BackwardUpdate(state, {~c.red: 1.0, ~c.grn: 2.0}, "add").apply()
+            BackwardUpdate(state, state.new({~c.red: -1.0}), "add").apply()
+            self.assertIs(state.grad[0], buffer)
+        BackwardUpdate(states[1], {~c.grn: 1.0}, "add", True).apply()
+        BackwardUpdate(states[0], {~c.grn: 1.0}, "add").apply()
+        self.assertEqual(states[0].grad[0].d, {~c.grn: 3.0})
+        self.assertEqual(states[1].grad[0].d, states[0].grad[0].d)
+        with self.assertRaises(ValueError):
+            BackwardUpdate(states[0], {Key("x"): 1.0}, "add").apply()
+
+
+    def test_trusted_shared_replaced(self) -> None:
+        c, index = self.c, self.ipt.main.index
+        state = State(index, {}, 0.0)
+        ForwardUpdate(state, {~c.red: 1.0}, "write").apply()
+        BackwardUpdate(state, {~c.red: 1.0}, "add").apply()
+        data, grad = state[0], state.grad[0]
+        deepcopy(data), deepcopy(grad)
+        ForwardUpdate(state, {~c.grn: 1.0}, "write", True).apply()
+        ForwardUpdate(state, {~c.grn: 1.0}, "add", True).apply()
+        BackwardUpdate(state, {~c.red: 1.0}, "add").apply()
+        self.assertIsNot(state[0], data)
+        self.assertIsNot(state.grad[0], grad)
+        self.assertEqual(data.d, {~c.red: 1.0})
+        self.assertEqual(grad.d, {~c.red: 1.0})
+        self.assertEqual(state[0].d, {~c.red: 1.0, ~c.grn: 2.0})
+        self.assertEqual(state.grad[0].d, {~c.red: 2.0})
+
+class BucketQueueTestCase(unittest.TestCase):
+
+    def test_order_matches_heap(self) -> None:
+        rng = random.Random(0)
+        heap, buckets = HeapQueue(), BucketQueue()
+        for i in range(200):
+            event = Event(self.test_order_matches_heap, [], 
+                priority=rng.choice([0, 32, 64, 96]), number=i)
+            event.tick = rng.randint(0, 5)
+            heap.push(event)
+            buckets.push(event)
+        self.assertEqual(len(buckets), 200)
+        self.assertCountEqual(list(buckets), list(heap))
+        while heap:
+            self.assertIs(buckets.pop(), heap.pop())
+        self.assertFalse(buckets)
+        self.assertRaises(IndexError, buckets.pop)
+
+
+class ClockTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with Agent("agent", DispatchRoot()) as self.agent:
+            pass
+        self.system = self.agent.system
+
+    def test_event_time(self) -> None:
+        system = self.system
+        system.schedule(self.agent.breakpoint(timedelta(milliseconds=3)))
+        event = system.advance()
+        self.assertEqual(event.tick, 3000)
+        self.assertEqual(event.time, timedelta(milliseconds=3))
+        self.assertEqual(system.clock.time, timedelta(milliseconds=3))
+
+    def test_resolution(self) -> None:
+        system = self.system
+        system.clock = Clock(res=timedelta(milliseconds=1))
+        system.clock.limit = timedelta(milliseconds=5)
+        self.assertEqual(system.clock.horizon, 5)
+        system.schedule(self.agent.breakpoint(timedelta(microseconds=2500)))
+        event = system.advance()
+        self.assertEqual(event.tick, 2)
+        self.assertEqual(event.time, timedelta(milliseconds=2))
+        self.assertRaises(ValueError, system.clock.advance, 1)
+        self.assertRaises(StopIteration, system.clock.advance, 6)
+
+    def test_time_and_limit(self) -> None:
+        clock = Clock(timedelta(milliseconds=2), limit=timedelta(seconds=1))
+        self.assertEqual((clock.tick, clock.horizon), (2000, 1000000))
+        clock.time = timedelta(milliseconds=5)
+        self.assertEqual(clock.tick, 5000)
+        self.assertEqual(clock.time, timedelta(milliseconds=5))
+
+    def test_pending(self) -> None:
+        system, source = self.system, self.agent.breakpoint
+        system.schedule(source(timedelta()))
+        system.schedule(source(timedelta(milliseconds=1)))
+        self.assertEqual(system.pending[source], 2)
+        system.advance()
+        self.assertEqual(system.pending[source], 1)
+        system.advance()
+        self.assertNotIn(source, system.pending)
+
+
+class CoalesceTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = DispatchRoot()
+        self.c = c = root.d.color
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, c)
+        self.ipt >> self.layer
+        self.system = self.agent.system
+        self.system.coalesce = True
+        self.system.schedule(self.ipt.send({c.red: 1.0}))
+        self.system.run_all()
+
+    def test_adds_merged(self) -> None:
+        c, system = self.c, self.system
+        for v in (1.0, 2.0):
+            system.schedule(Event(self.agent.breakpoint, 
+                [BackwardUpdate(self.layer.main, {~c.red: v}, "add")]))
+        system.advance()
+        self.assertEqual(system.queue.peek().source, self.layer.backward)
+        self.assertEqual(len(system.queue), 1)
+        self.assertEqual(self.layer.main.grad[0][~c.red], 3.0)
+
+    def test_last_push_wins(self) -> None:
+        c, system = self.c, self.system
+        system.schedule(self.ipt.send({c.red: 1.0}))
+        system.schedule(self.ipt.send({c.grn: 1.0}))
+        system.advance()
+        self.assertEqual(self.ipt.main[0].d, {~c.grn: 1.0})
+        self.assertEqual(len(system.queue), 1)
+
+    def test_routes_see_merged_updates(self) -> None:
+        c, system = self.c, self.system
+        with self.agent:
+            listener = Listener("listener")
+        listener.subscribe((ForwardUpdate, self.ipt.main))
+        system.schedule(self.ipt.send({c.red: 1.0}))
+        system.schedule(self.ipt.send({c.grn: 1.0}))
+        system.advance()
+        event, = listener.seen
+        ud, = event.index(ForwardUpdate)[self.ipt.main]
+        self.assertEqual(ud.data, {~c.grn: 1.0})
+
+
+class ParallelTestCase(unittest.TestCase):
+
+    def build(self, executor: ThreadPoolExecutor | None) -> tuple:
+        root = DispatchRoot()
+        c = root.d.color
+        with Agent("agent", root) as agent:
+            ipts = [Input(f"ipt{i}", c) for i in range(3)]
+            layers = [Layer(f"layer{i}", c, c) for i in range(3)]
+        for ipt, layer in zip(ipts, layers):
+            ipt >> layer
+            with layer.weights[0].mutable() as w:
+                for i, k in enumerate(layer.weights.index):
+                    w[k] = .1 * i
+        agent.system.executor = executor
+        for i, ipt in enumerate(ipts):
+            agent.system.schedule(ipt.send({c.red: 1.0 + i, c.grn: -i}))
+        return agent, layers
+
+    def test_matches_sequential(self) -> None:
+        agent, layers = self.build(None)
+        agent.run_all()
+        with ThreadPoolExecutor(2) as executor:
+            agent_p, layers_p = self.build(executor)
+            agent_p.system.advance()
+            sources = [event.source for event in agent_p.system.queue]
+            self.assertEqual(sources, [l.forward for l in layers_p])
+            agent_p.run_all()
+        for layer, layer_p in zip(layers, layers_p):
+            self.assertEqual(layer.main[0].d, layer_p.main[0].d)
+
+    def backward(self, agent: Agent, layers: list[Layer]) -> None:
+        agent.run_all()
+        red = next(iter(layers[0].main.index))
+        for layer in layers:
+            agent.system.schedule(Event(agent.breakpoint, 
+                [BackwardUpdate(layer.main, {red: 1.0})]))
+        agent.run_all()
+
+    def test_backward_matches_sequential(self) -> None:
+        agent, layers = self.build(None)
+        self.backward(agent, layers)
+        with ThreadPoolExecutor(2) as executor:
+            agent_p, layers_p = self.build(executor)
+            self.backward(agent_p, layers_p)
+        for layer, layer_p in zip(layers, layers_p):
+            self.assertEqual(layer.weights.grad[0].d, 
+                layer_p.weights.grad[0].d)
+            self.assertEqual(layer.input.grad[0].d, layer_p.input.grad[0].d)
+
+    def test_process_executor_rejected(self) -> None:
+        with ProcessPoolExecutor(1) as executor:
+            agent, _ = self.build(executor)
+            self.assertRaisesRegex(TypeError, "threads", agent.system.advance)
+
+
+    def test_sibling_reads_match_sequential(self) -> None:
+        seen = []
+        for executor in (None, ThreadPoolExecutor(2)):
+            agent, layers = self.build(executor)
+            ipts = [p for p in agent.system.procs if isinstance(p, Input)]
+            with agent:
+                reader = Reader("reader", ipts[1].main)
+            reader.subscribe((ForwardUpdate, ipts[0].main))
+            agent.run_all()
+            seen.append(reader.seen)
+            if executor is not None:
+                executor.shutdown()
+        self.assertEqual(seen[0], [{}])
+        self.assertEqual(seen[0], seen[1])
+
+class ProfilerTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = DispatchRoot()
+        self.c = c = root.d.color
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, c)
+        self.ipt >> self.layer
+        self.system = self.agent.system
+        self.profiler = self.system.profiler = Profiler()
+
+    def test_records(self) -> None:
+        system, c = self.system, self.c
+        for v in (1.0, 2.0):
+            system.schedule(self.ipt.send({c.red: v}))
+            system.run_all()
+        system.schedule(Event(self.agent.breakpoint, 
+            [BackwardUpdate(self.layer.main, {~c.red: 1.0})]))
+        system.run_all()
+        records = {(name, phase): n 
+            for name, phase, n, _ in self.profiler.records()}
+        self.assertEqual(records["ipt.send", "apply"], 2)
+        self.assertEqual(records["ipt.send", "resolve"], 2)
+        self.assertNotIn(("ipt.send", "construct"), records)
+        self.assertEqual(records["layer.forward", "construct"], 2)
+        self.assertEqual(records["layer.backward", "construct"], 1)
+        self.assertEqual(records["layer", "process"], 3)
+        self.assertIn("layer.forward", self.profiler.report())
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "profile.csv")
+            self.profiler.dump(path)
+            with open(path, newline="") as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["name", "phase", "count", "time"])
+        self.assertEqual(len(rows) - 1, len(records))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import tempfile
+import os
+
+from pyClarion import Agent, Input, Layer, Event, Atom, Atoms
+from pyClarion.knowledge import DataFamily, Root
+from pyClarion.events import BackwardUpdate, TraceWriter, read_trace
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+
+
+class Data(DataFamily):
+    color: Color
+
+
+class TraceRoot(Root):
+    d: Data
+
+
+class Collector:
+
+    def __init__(self) -> None:
+        self.events = []
+
+    def write(self, event: Event) -> None:
+        self.events.append(event)
+
+
+class TraceTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = TraceRoot()
+        self.c = c = root.d.color
+        with Agent("agent", root) as self.agent:
+            self.ipt = Input("ipt", c)
+            self.layer = Layer("layer", c, c)
+        self.ipt >> self.layer
+        self.collector = Collector()
+        self.agent.system.sinks.append(self.collector)
+
+    def simulate(self) -> None:
+        system, c = self.agent.system, self.c
+        for v in (1.0, 2.0):
+            system.schedule(self.ipt.send({c.red: v}))
+            system.run_all()
+        system.schedule(Event(self.agent.breakpoint, 
+            [BackwardUpdate(self.layer.main, {~c.grn: 1.0})]))
+        system.run_all()
+
+    def test_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.bin")
+            with TraceWriter(self.agent.system, path, payloads=True, chunk=3):
+                self.simulate()
+            records = list(read_trace(path))
+        self.assertEqual(len(records), len(self.collector.events))
+        for record, event in zip(records, self.collector.events):
+            self.assertEqual(record.time, event.time)
+            self.assertEqual(record.priority, event.priority)
+            self.assertEqual(record.number, event.number)
+            self.assertEqual(len(record.updates), len(event.updates))
+            for (kind, _, data), ud in zip(record.updates, event.updates):
+                self.assertEqual(kind, type(ud).__qualname__)
+                self.assertEqual(data, getattr(ud, "data", None))
+        self.assertEqual(records[0].source, "ipt.send")
+        self.assertEqual(records[0].updates[0][:2], 
+            ("ForwardUpdate", "ipt.main"))
+        self.assertEqual(records[1].source, "layer.forward")
+        record, = [r for r in records if r.source == "agent.breakpoint"]
+        self.assertEqual(record.updates[0][1:], ("layer.main", 
+            {~self.c.grn: 1.0}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from pyClarion import Agent, Input, Layer
+from pyClarion.knowledge import Root, DataFamily, Atoms, Atom
+from pyClarion.numdicts import (Index, NumDict, OpProfiler, numdict, 
+    keyform)
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+    blu: Atom
+
+
+class Data(DataFamily):
+    color: Color
+
+
+class ProfRoot(Root):
+    d: Data
+
+
+class Component:
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def step(self, d):
+        return d.mul(d).sum(d)
+
+
+class OpProfilerTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        root = ProfRoot()
+        c = root.d.color
+        self.d = numdict(Index(root, keyform(c)), {~c.red: 1.0, ~c.grn: 2.0},
+            0.0)
+
+    def test_records(self) -> None:
+        comp = Component("comp")
+        with OpProfiler() as prof:
+            comp.step(self.d)
+            comp.step(self.d)
+            self.d.exp()
+        self.d.neg()
+        records = {(op, caller): (n, n_in, n_out)
+            for op, caller, n, n_in, n_out, _ in prof.records()}
+        self.assertEqual(set(records),
+            {("Mul", "comp"), ("Sum", "comp"), ("Exp", "OpProfilerTestCase")})
+        self.assertEqual(records["Mul", "comp"], (2, 8, 4))
+        self.assertEqual(records["Sum", "comp"], (2, 8, 4))
+        self.assertIsNone(OpProfiler.STACK.get())
+
+    def test_direct_op_calls(self) -> None:
+        root = ProfRoot()
+        c = root.d.color
+        with Agent("agent", root) as agent:
+            ipt = Input("ipt", c)
+            layer = Layer("layer", c, c, func=NumDict.tanh)
+        ipt >> layer
+        with OpProfiler() as prof:
+            agent.system.schedule(ipt.send({c.red: 1.0}))
+            agent.run_all()
+        records = {(op, caller) for op, caller, *_ in prof.records()}
+        self.assertIn(("Tanh", "layer"), records)
+        self.assertIn(("Mul", "layer"), records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import tempfile
+import pickle
+import os
+
+from pyClarion.knowledge import Root, DataFamily, Atoms, Atom
+from pyClarion.numdicts import (Index, Key, NumDictWriter, NumDictFile, 
+    Undefined, numdict, keyform)
+
+
+class Color(Atoms):
+    red: Atom
+    grn: Atom
+    blu: Atom
+
+
+class Data(DataFamily):
+    color: Color
+
+
+class SerialRoot(Root):
+    d: Data
+
+
+class SerialTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.root = root = SerialRoot()
+        c = root.d.color
+        i1 = Index(root, keyform(c))
+        i2 = Index(root, keyform(c) * keyform(c))
+        self.ds = {
+            "v": numdict(i1, {~c.red: 1.0, ~c.grn: -2.5}, 0.0),
+            "w": numdict(i2, {~c.red * ~c.blu: 3.0}, Undefined),
+            "e": numdict(i1, {}, 1.0)}
+
+    def test_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "nd.bin")
+            with NumDictWriter(path) as writer:
+                for name, nd in self.ds.items():
+                    writer.write(name, nd)
+            with NumDictFile(path) as f:
+                self.assertEqual(list(f), ["v", "w", "e"])
+                for name, nd in self.ds.items():
+                    new = f.load(name, self.root)
+                    self.assertEqual(new.i.kf, nd.i.kf)
+                    self.assertEqual(new.d, nd.d)
+                    self.assertEqual(repr(new.c), repr(nd.c))
+                    self.assertEqual(f.load(name, nd.i).d, nd.d)
+                values = f.values("v")
+                self.assertEqual(list(values), [1.0, -2.5])
+                values.release()
+                with self.assertRaises(ValueError):
+                    f.load("v", self.ds["w"].i)
+
+    def test_close_with_live_view(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "nd.bin")
+            with NumDictWriter(path) as writer:
+                writer.write("v", self.ds["v"])
+            f = NumDictFile(path)
+            values = f.values("v")
+            with self.assertRaisesRegex(BufferError, "values"):
+                f.close()
+            self.assertEqual(f.load("v", self.root).d, self.ds["v"].d)
+            self.assertEqual(list(values), [1.0, -2.5])
+            values.release()
+            f.close()
+            f.close()
+
+    def test_pickle_key(self) -> None:
+        key = Key("(d,d):(color,color):(red,blu)")
+        self.assertEqual(pickle.loads(pickle.dumps(key)), key)
+
+
+if __name__ == "__main__":
+    unittest.main()